@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import json
+import sys
+from core.metrics import metrics
+
+class BatchRunner:
+    def __init__(self, skills, memory=None, router=None, concurrency: int = 4, recall_limit: int = 5):
+        self.skills = skills
+        self.memory = memory
+        self.router = router
+        self.concurrency = concurrency
+        self.recall_limit = recall_limit
+
+    def group(self, inputs):
+        groups = {}
+        for i, text in enumerate(inputs):
+            skill = self.skills.match(text)
+            if skill is not None:
+                key = ("skill", skill)
+            elif self.router is not None:
+                key = ("model", self.router.choose_model_name(text))
+            else:
+                key = ("unmatched", None)
+            groups.setdefault(key, []).append(i)
+        return groups
+
+    async def _contexts(self, inputs, indices):
+        contexts = {}
+        if self.memory is None or not indices:
+            return contexts
+        recalled = await asyncio.to_thread(self.memory.recall_many, [inputs[i] for i in indices], self.recall_limit)
+        for i, entries in zip(indices, recalled):
+            contexts[i] = "Relevant memory:\n" + "\n".join(f"- {e['content'][:200]}" for e in entries)
+        return contexts
+
+    async def _run_skill_group(self, name, indices, inputs, futures, semaphore):
+        async def run_one(i):
+            async with semaphore:
+                try:
+                    futures[i].set_result({"response": await self.skills.execute(name, inputs[i]), "skill": name})
+                except Exception as e:
+                    futures[i].set_result({"error": str(e)})
+
+        with metrics.timer("batch_group", kind="skill", group=name):
+            await asyncio.gather(*(run_one(i) for i in indices))
+
+    async def _run_model_group(self, name, indices, inputs, contexts, futures, semaphore):
+        # A llama.cpp model is not safe to call from several threads, so each
+        # model group runs sequentially while different models run in parallel.
+        async with semaphore:
+            with metrics.timer("batch_group", kind="model", group=name):
+                for i in indices:
+                    try:
+                        response = await asyncio.to_thread(self.router.run, inputs[i], contexts.get(i, ""))
+                        futures[i].set_result({"response": response, "model": name})
+                    except Exception as e:
+                        futures[i].set_result({"error": str(e)})
+
+    async def run(self, inputs):
+        """Yields one result dict per input, in input order, as soon as each is ready."""
+        inputs = [text.strip() for text in inputs]
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in inputs]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        with metrics.timer("skill_routing", batch=True):
+            groups = self.group(inputs)
+        model_indices = [i for (kind, _), indices in groups.items() if kind == "model" for i in indices]
+        contexts = await self._contexts(inputs, model_indices)
+
+        tasks = []
+        for (kind, name), indices in groups.items():
+            if kind == "skill":
+                tasks.append(asyncio.create_task(self._run_skill_group(name, indices, inputs, futures, semaphore)))
+            elif kind == "model":
+                tasks.append(asyncio.create_task(self._run_model_group(name, indices, inputs, contexts, futures, semaphore)))
+            else:
+                for i in indices:
+                    futures[i].set_result({"response": "[SkillManager] No matching skill found."})
+
+        try:
+            for i, future in enumerate(futures):
+                yield {"index": i, "input": inputs[i], **(await future)}
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_all(self, inputs):
+        return [result async for result in self.run(inputs)]
+
+async def _main(args):
+    from core.config import load_config
+    from core.memory_manager import MemoryManager
+    from core.semantic_memory import SemanticMemory
+    from core.skill_manager import SkillManager
+
+    config = load_config()
+    memory = MemoryManager(config)
+    skills = SkillManager(config, gpt=None, memory=memory, semantic=SemanticMemory(config))
+    router = None
+    if args.local_models:
+        from core.llm_router import LP1Router
+        router = LP1Router()
+
+    with open(args.input, "r", encoding="utf-8") as f:
+        inputs = [line for line in f.read().splitlines() if line.strip()]
+    runner = BatchRunner(skills, memory=memory, router=router, concurrency=args.concurrency)
+    async for result in runner.run(inputs):
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Answer a file of prompts (one per line) as NDJSON.")
+    parser.add_argument("input")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--local-models", action="store_true", help="Route unmatched prompts to the local GGUF models.")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,150 @@
+import ast
+import fnmatch
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from core.workspace import IGNORED_DIRS
+
+PARALLEL_THRESHOLD = 32
+CACHE_DIR = "./data/code_index"
+
+def default_cache_path(base_dir: str) -> str:
+    # One cache file per indexed tree, so indexes of different directories never overwrite each other.
+    base_dir = os.path.abspath(base_dir)
+    digest = hashlib.sha256(base_dir.encode("utf-8")).hexdigest()[:12]
+    return os.path.join(CACHE_DIR, f"{os.path.basename(base_dir) or 'root'}-{digest}.json")
+
+def parse_source(source: str, path: str) -> dict:
+    try:
+        tree = ast.parse(source, filename=path)
+    except (SyntaxError, ValueError) as e:
+        return {"module_doc": "", "functions": [], "error": str(e)}
+
+    functions = []
+
+    def visit(node, prefix):
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                doc = ast.get_docstring(child) or ""
+                start = min([d.lineno for d in child.decorator_list] + [child.lineno])
+                functions.append({
+                    "function": child.name,
+                    "qualname": prefix + child.name,
+                    "args": [arg.arg for arg in child.args.args],
+                    "doc": doc[:100].replace("\n", " "),
+                    "is_async": isinstance(child, ast.AsyncFunctionDef),
+                    "lineno": start,
+                    "end_lineno": child.end_lineno
+                })
+                visit(child, prefix + child.name + ".")
+            elif isinstance(child, ast.ClassDef):
+                visit(child, prefix + child.name + ".")
+
+    visit(tree, "")
+    return {"module_doc": ast.get_docstring(tree) or "", "functions": functions, "error": None}
+
+def _parse_job(job):
+    path, source = job
+    return path, parse_source(source, path)
+
+class CodeIndex:
+    def __init__(self, base_dir, cache_path="auto", ignore=None, workers=None):
+        """cache_path="auto" derives the cache file from base_dir; None disables caching."""
+        self.base_dir = os.path.abspath(base_dir)
+        self.cache_path = default_cache_path(self.base_dir) if cache_path == "auto" else cache_path
+        self.ignore = list(ignore or [])
+        self.workers = workers
+        self.files = self._load()
+
+    def _load(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def save(self):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.cache_path)), exist_ok=True)
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.files, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _ignored(self, rel_path: str) -> bool:
+        return any(fnmatch.fnmatch(rel_path, pattern) for pattern in self.ignore)
+
+    def _scan(self):
+        for root, dirs, files in os.walk(self.base_dir):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS and not d.startswith(".")
+                       and not self._ignored(os.path.relpath(os.path.join(root, d), self.base_dir))]
+            for name in files:
+                path = os.path.join(root, name)
+                if name.endswith(".py") and not self._ignored(os.path.relpath(path, self.base_dir)):
+                    yield path
+
+    def refresh(self) -> dict:
+        stats = {"files": 0, "parsed": 0, "unchanged": 0, "removed": 0}
+        seen = set()
+        jobs = []
+        touched = False
+        for path in self._scan():
+            seen.add(path)
+            stats["files"] += 1
+            st = os.stat(path)
+            entry = self.files.get(path)
+            if entry and entry["mtime"] == st.st_mtime and entry["size"] == st.st_size:
+                stats["unchanged"] += 1
+                continue
+            with open(path, "rb") as f:
+                raw = f.read()
+            digest = hashlib.sha256(raw).hexdigest()
+            if entry and entry["sha256"] == digest:
+                entry["mtime"], entry["size"] = st.st_mtime, st.st_size
+                stats["unchanged"] += 1
+                touched = True
+                continue
+            self.files[path] = {"mtime": st.st_mtime, "size": st.st_size, "sha256": digest}
+            jobs.append((path, raw.decode("utf-8", errors="replace")))
+
+        if len(jobs) >= PARALLEL_THRESHOLD:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(_parse_job, jobs, chunksize=16))
+        else:
+            results = [_parse_job(job) for job in jobs]
+        for path, parsed in results:
+            self.files[path].update(parsed)
+        stats["parsed"] = len(results)
+
+        prefix = self.base_dir + os.sep
+        for path in [p for p in self.files if p.startswith(prefix) and p not in seen]:
+            del self.files[path]
+            stats["removed"] += 1
+
+        if touched or stats["parsed"] or stats["removed"]:
+            self.save()
+        return stats
+
+    def entries(self):
+        prefix = self.base_dir + os.sep
+        return {path: entry for path, entry in self.files.items() if path.startswith(prefix)}
+
+    def functions(self):
+        results = []
+        for path, entry in sorted(self.entries().items()):
+            for fn in entry.get("functions", []):
+                results.append({"file": path, **fn})
+        return results
+
+    def find(self, path: str, name: str):
+        entry = self.files.get(os.path.abspath(path))
+        if not entry:
+            return None
+        for fn in entry.get("functions", []):
+            if name in (fn["qualname"], fn["function"]):
+                return fn
+        return None
@@ -1,18 +1,40 @@
 import difflib
 import os
+from core.code_index import CodeIndex
 
 class CodeRewriter:
+    def __init__(self, llm=None, index=None):
+        self.llm = llm
+        self.index = index
+
+    def locate(self, path: str, target_fn: str):
+        if self.index is None:
+            self.index = CodeIndex(os.path.dirname(os.path.abspath(path)))
+        fn = self.index.find(path, target_fn)
+        if fn is None:
+            self.index.refresh()
+            fn = self.index.find(path, target_fn)
+        return fn
 
     async def propose_edit(self, path: str, target_fn: str, summary: str) -> str:
         try:
             with open(path, "r", encoding="utf-8") as f:
                 original = f.read()
 
+            fn = self.locate(path, target_fn)
+            if fn is None:
+                return f"[Rewriter Error] Function '{target_fn}' not found in {path}"
+            lines = original.splitlines()
+            source = "\n".join(lines[fn["lineno"] - 1:fn["end_lineno"]])
+
             prompt = (
                 f"You're LP1's self-optimizing AI. Here's a function called '{target_fn}' from the file '{path}'.\n"
                 f"Its summary is: {summary}\n"
                 "Improve clarity, safety, or performance if possible. Respond ONLY with valid updated code, no explanation."
             )
+            if self.llm is None:
+                return "[Rewriter Error] No language model configured."
+            patch = self.llm.run(source, prompt)
             return patch if patch.strip().startswith("import") or "def" in patch else "[Rejected: Invalid response]"
         except Exception as e:
             return f"[Rewriter Error] {e}"
@@ -1,3 +1,4 @@
+import json
 import os
 from dotenv import load_dotenv
 
@@ -9,6 +10,14 @@ def load_config():
         "data_path": os.getenv("LP1_DATA_PATH", "./data"),
         "vector_store": os.getenv("LP1_VECTOR_STORE", "./data/knowledge_vectors.faiss"),
         "memory_file": os.getenv("LP1_MEMORY_FILE", "./data/lp1_memory.json"),
-        "log_feedback": os.getenv("LP1_FEEDBACK_LOG", "./data/feedback.json"),
-        "patch_path": os.getenv("LP1_PATCH_FILE", "./data/patch.diff")
+        "log_feedback": os.getenv("LP1_FEEDBACK_LOG", "./data/feedback.jsonl"),
+        "patch_path": os.getenv("LP1_PATCH_FILE", "./data/patch.diff"),
+        "state_socket": os.getenv("LP1_STATE_SOCKET"),
+        "goal_concurrency": int(os.getenv("LP1_GOAL_CONCURRENCY", "4")),
+        "goal_timeout": float(os.getenv("LP1_GOAL_TIMEOUT", "120")),
+        "warmup": os.getenv("LP1_WARMUP", "0") == "1",
+        "dedup_policies": json.loads(os.getenv("LP1_DEDUP_POLICIES", "{}")),
+        "profile_report": os.getenv("LP1_PROFILE_REPORT", "./data/hot_paths.json"),
+        "local_models": os.getenv("LP1_LOCAL_MODELS", "0") == "1",
+        "batch_max_concurrency": int(os.getenv("LP1_BATCH_MAX_CONCURRENCY", "8"))
     }
\ No newline at end of file
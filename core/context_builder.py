@@ -1,17 +1,20 @@
 
-from core.goal_engine import get_active_goal
-from core.memory_manager import summarize_memory
-from core.skill_manager import list_active_skills
+def summarize_memory(memory, limit: int = 5):
+    # Most recent entries of the current session, oldest first.
+    with memory.lock:
+        recent = [e for e in memory.memory if e.get("session_id") == memory.session_id][-limit:]
+    return " | ".join(f"{e['role']}: {e['content'][:120]}" for e in recent) or "None"
 
-def build_context():
-    goal = get_active_goal()
-    skills = list_active_skills()
-    memory_summary = summarize_memory()
+def build_context(memory, goals=None, skills=None):
+    active = goals.get_active_goals() if goals else []
+    goal = active[-1]["description"] if active else "None"
+    skill_names = list(skills.skills) if skills else []
+    memory_summary = summarize_memory(memory)
 
     context = f"""
     You are LP1's cognitive engine.
     Active Goal: {goal}
-    Active Skills: {', '.join(skills)}
+    Active Skills: {', '.join(skill_names) or 'None'}
     Recent Memory Summary: {memory_summary}
     Respond in a way that progresses the goal, uses available skills, and respects the user’s intent.
     """
@@ -0,0 +1,80 @@
+import hashlib
+from collections import deque
+from datetime import datetime
+import numpy as np
+from core.metrics import metrics
+
+# Per-role policy: exact content hashing, optional cosine similarity against the
+# last `window` entries of that role, optionally restricted to the same goal/topic
+# and/or the same session. Conversation turns are not deduplicated by default: a
+# repeated "yes" is a new turn, and recall() only sees the current session.
+DEFAULT_POLICIES = {
+    "knowledge": {"exact": True, "similarity": 0.93, "window": 500, "same_topic": True, "same_session": False},
+    "fallback": {"exact": True, "similarity": 0.97, "window": 200, "same_topic": False, "same_session": True},
+    "assistant": {"exact": False, "similarity": None, "window": 0, "same_topic": False, "same_session": True},
+    "user": {"exact": False, "similarity": None, "window": 0, "same_topic": False, "same_session": True},
+}
+
+def content_hash(text: str) -> str:
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class Deduplicator:
+    def __init__(self, policies=None):
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.hashes = {}
+        self.recent = {}
+        self.stats = {}
+
+    def _stats(self, role):
+        return self.stats.setdefault(role, {"checked": 0, "exact": 0, "near": 0, "bytes_saved": 0})
+
+    def track(self, entry: dict):
+        role = entry.get("role")
+        policy = self.policies.get(role)
+        if not policy or not entry.get("content"):
+            return
+        if policy.get("exact"):
+            self.hashes[self._key(policy, role, entry["content"], entry.get("session_id"))] = entry
+        if policy.get("similarity") and policy.get("window") and "embedding" in entry:
+            self.recent.setdefault(role, deque(maxlen=policy["window"])).append(entry)
+
+    @staticmethod
+    def _key(policy, role, content, session_id):
+        return (role, session_id if policy.get("same_session") else None, content_hash(content))
+
+    def find_exact(self, role: str, content: str, session_id=None):
+        policy = self.policies.get(role)
+        if not policy:
+            return None
+        self._stats(role)["checked"] += 1
+        if policy.get("exact"):
+            return self.hashes.get(self._key(policy, role, content, session_id))
+        return None
+
+    def find_similar(self, role: str, embedding, topic=None, session_id=None):
+        policy = self.policies.get(role)
+        if not policy or not policy.get("similarity"):
+            return None
+        candidates = [
+            e for e in self.recent.get(role, ())
+            if (not policy.get("same_topic") or e.get("goal_id") == topic)
+            and (not policy.get("same_session") or e.get("session_id") == session_id)
+        ]
+        if not candidates:
+            return None
+        matrix = np.asarray([e["embedding"] for e in candidates], dtype=np.float32)
+        query = np.asarray(embedding, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        scores = matrix @ query / np.where(norms == 0, 1.0, norms)
+        best = int(np.argmax(scores))
+        return candidates[best] if scores[best] >= policy["similarity"] else None
+
+    def merge(self, existing: dict, content: str, kind: str):
+        existing["hits"] = existing.get("hits", 1) + 1
+        existing["last_seen"] = datetime.utcnow().isoformat()
+        stats = self._stats(existing.get("role"))
+        stats[kind] += 1
+        stats["bytes_saved"] += len(content.encode("utf-8"))
+        metrics.inc("lp1_dedup_merged_total", help_text="Writes merged into an existing entry.", role=existing.get("role"), kind=kind)
+        return existing
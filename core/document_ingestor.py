@@ -0,0 +1,162 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import datetime
+
+from skills.document_reader import SUPPORTED_EXTENSIONS, extract_text
+
+def file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def chunk_text(text: str, chunk_size: int = 200, overlap: int = 40):
+    words = text.split()
+    if not words:
+        return []
+    step = max(1, chunk_size - overlap)
+    chunks = []
+    for start in range(0, len(words), step):
+        chunks.append(" ".join(words[start:start + chunk_size]))
+        if start + chunk_size >= len(words):
+            break
+    return chunks
+
+def _parse_file(path: str, known_hash: str, chunk_size: int, overlap: int) -> dict:
+    # Runs in a worker process, so it only returns plain data.
+    try:
+        content_hash = file_hash(path)
+        if content_hash == known_hash:
+            return {"path": path, "hash": content_hash, "skipped": True}
+        chunks = chunk_text(extract_text(path), chunk_size, overlap)
+        return {"path": path, "hash": content_hash, "chunks": chunks}
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+class DocumentIngestor:
+    def __init__(self, config, semantic, workers: int = None, chunk_size: int = 200, overlap: int = 40,
+                 batch_size: int = 256, checkpoint_every: int = 500):
+        self.semantic = semantic
+        self.workers = workers or os.cpu_count()
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.batch_size = batch_size
+        self.checkpoint_every = checkpoint_every
+        self.manifest_path = os.path.join(config["data_path"], "ingest_manifest.json")
+        os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_manifest(self):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def collect(self, source: str):
+        if os.path.isdir(source):
+            paths = []
+            for root, _, files in os.walk(source):
+                paths.extend(os.path.join(root, name) for name in files)
+        else:
+            paths = glob.glob(source, recursive=True)
+        return sorted(os.path.abspath(p) for p in paths if p.lower().endswith(SUPPORTED_EXTENSIONS))
+
+    def _flush(self, texts, sources, entries):
+        # Vectors are saved before the manifest, so an interrupted run re-ingests
+        # the unsaved files instead of marking them done. Chunks from a previous
+        # version of a changed file are dropped first so they don't linger.
+        removed = self.semantic.remove_sources([path for path in entries if path in self.manifest], save=False)
+        if texts:
+            self.semantic.store_many(texts, batch_size=self.batch_size, save=True, sources=sources)
+        elif removed:
+            self.semantic.save()
+        self.manifest.update(entries)
+        self._save_manifest()
+        print(f"[DocumentIngestor] Checkpoint: {len(entries)} files, {len(texts)} chunks")
+        texts.clear()
+        sources.clear()
+        entries.clear()
+
+    def _parse_all(self, pool, paths):
+        # Keeps a bounded window of parses in flight, so finished results (and
+        # their chunk lists) are released as soon as they have been consumed.
+        paths = iter(paths)
+        in_flight = set()
+        while True:
+            for path in paths:
+                in_flight.add(pool.submit(_parse_file, path, self.manifest.get(path, {}).get("hash"),
+                                          self.chunk_size, self.overlap))
+                if len(in_flight) >= self.workers * 4:
+                    break
+            if not in_flight:
+                return
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+    def ingest(self, source: str) -> dict:
+        paths = self.collect(source)
+        stats = {"files": len(paths), "ingested": 0, "skipped": 0, "failed": 0, "chunks": 0}
+        print(f"[DocumentIngestor] Found {len(paths)} documents in {source}")
+        if not paths:
+            return stats
+
+        pending_texts = []
+        pending_sources = []
+        pending_entries = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for result in self._parse_all(pool, paths):
+                if result.get("skipped"):
+                    stats["skipped"] += 1
+                    continue
+                if "error" in result:
+                    print(f"[DocumentIngestor] Failed: {result['path']} — {result['error']}")
+                    stats["failed"] += 1
+                    continue
+
+                pending_texts.extend(result["chunks"])
+                pending_sources.extend([result["path"]] * len(result["chunks"]))
+                pending_entries[result["path"]] = {
+                    "hash": result["hash"],
+                    "chunks": len(result["chunks"]),
+                    "ingested": datetime.utcnow().isoformat()
+                }
+                stats["ingested"] += 1
+                stats["chunks"] += len(result["chunks"])
+                if len(pending_entries) >= self.checkpoint_every:
+                    self._flush(pending_texts, pending_sources, pending_entries)
+
+        if pending_entries:
+            self._flush(pending_texts, pending_sources, pending_entries)
+        print(f"[DocumentIngestor] Done: {stats}")
+        return stats
+
+if __name__ == "__main__":
+    from core.config import load_config
+    from core.semantic_memory import SemanticMemory
+
+    parser = argparse.ArgumentParser(description="Bulk-ingest documents into LP1's semantic memory.")
+    parser.add_argument("source", help="Directory or glob pattern (e.g. 'docs/**/*.pdf')")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--checkpoint-every", type=int, default=500)
+    args = parser.parse_args()
+
+    config = load_config()
+    ingestor = DocumentIngestor(config, SemanticMemory(config), workers=args.workers,
+                                batch_size=args.batch_size, checkpoint_every=args.checkpoint_every)
+    ingestor.ingest(args.source)
@@ -1,31 +1,118 @@
 import json
 import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
+from uuid import uuid4
+from core.metrics import metrics
+
+FEEDBACK_VALUES = {
+    "yes": True,
+    "positive": True,
+    "helpful": True,
+    "no": False,
+    "negative": False,
+    "unhelpful": False
+}
 
 class FeedbackEngine:
-    def __init__(self, config):
+    def __init__(self, config, max_pending: int = 10000):
+        # Feedback is an append-only JSON-lines log; aggregates live in a small
+        # sidecar file so they can be queried without scanning the log.
         self.path = config["log_feedback"]
+        self.stats_path = os.path.splitext(self.path)[0] + "_stats.json"
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.max_pending = max_pending
+        self.pending = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = self._load_stats()
+
+    def _load_stats(self):
+        if not os.path.exists(self.stats_path):
+            return {}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _save_stats(self):
+        tmp_path = self.stats_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.stats, f)
+        os.replace(tmp_path, self.stats_path)
+
+    def register(self, user_input: str, response: str, skill: str = None, model: str = None,
+                 response_id: str = None) -> str:
+        response_id = response_id or uuid4().hex[:12]
+        with self.lock:
+            self.pending[response_id] = {
+                "input": user_input,
+                "response": response,
+                "skill": skill,
+                "model": model
+            }
+            while len(self.pending) > self.max_pending:
+                self.pending.popitem(last=False)
+        return response_id
 
-    async def capture(self, user_input: str, response: str):
-        print("Was this helpful? (yes/no/skip): ", end="")
-        answer = input().strip().lower()
-        if answer not in {"yes", "no"}:
-            return
+    def record(self, response_id: str, feedback: str):
+        """Returns the logged entry, or None for an unrecognized value or an unknown/already-rated id."""
+        helpful = FEEDBACK_VALUES.get(feedback.strip().lower())
+        if helpful is None:
+            return None
+
+        with self.lock:
+            context = self.pending.pop(response_id, None)
+        if context is None:
+            return None
+        now = datetime.utcnow()
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "input": user_input,
-            "response": response,
-            "feedback": answer
+            "timestamp": now.isoformat(),
+            "response_id": response_id,
+            "input": context.get("input"),
+            "response": context.get("response"),
+            "skill": context.get("skill"),
+            "model": context.get("model"),
+            "feedback": "yes" if helpful else "no"
         }
         try:
-            if os.path.exists(self.path):
-                with open(self.path, "r") as f:
-                    data = json.load(f)
-            else:
-                data = []
-            data.append(log_entry)
-            with open(self.path, "w") as f:
-                json.dump(data, f, indent=2)
+            with self.lock, metrics.timer("persist", component="feedback"):
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(log_entry) + "\n")
+                self._update_stats(log_entry, helpful, now.strftime("%Y-%m-%d"))
+                self._save_stats()
         except Exception as e:
             print(f"[FeedbackEngine] Failed to log feedback: {e}")
+            return None
+        return log_entry
+
+    def _update_stats(self, entry: dict, helpful: bool, day: str):
+        keys = [("all", "all"), ("skill", entry["skill"] or "none"), ("model", entry["model"] or "none")]
+        for dimension, key in keys:
+            bucket = self.stats.setdefault(dimension, {}).setdefault(key, {}).setdefault(day, {"helpful": 0, "total": 0})
+            bucket["total"] += 1
+            if helpful:
+                bucket["helpful"] += 1
+
+    def summary(self, dimension: str = "all", day: str = None) -> dict:
+        result = {}
+        with self.lock:
+            for key, days in self.stats.get(dimension, {}).items():
+                helpful = total = 0
+                for bucket_day, bucket in days.items():
+                    if day and bucket_day != day:
+                        continue
+                    helpful += bucket["helpful"]
+                    total += bucket["total"]
+                if total:
+                    result[key] = {"helpful": helpful, "total": total, "helpful_rate": round(helpful / total, 4)}
+        return result
+
+    def daily(self, dimension: str = "all", key: str = "all") -> dict:
+        with self.lock:
+            return {
+                day: {**bucket, "helpful_rate": round(bucket["helpful"] / bucket["total"], 4)}
+                for day, bucket in sorted(self.stats.get(dimension, {}).get(key, {}).items())
+                if bucket["total"]
+            }
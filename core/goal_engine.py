@@ -1,59 +1,142 @@
 
+import asyncio
 import json
 import os
+import threading
 from datetime import datetime
 from uuid import uuid4
 
 class GoalEngine:
-    def __init__(self, config, memory, gpt):
+    def __init__(self, config, memory, gpt, compact_every: int = 500):
+        # goals.json is a snapshot; every change since the snapshot is appended to a
+        # journal, which is folded back into the snapshot once it grows large.
         self.path = os.path.join(config["data_path"], "goals.json")
+        self.journal_path = os.path.join(config["data_path"], "goals.journal.jsonl")
         self.memory = memory
+        self.gpt = gpt
+        self.concurrency = int(config.get("goal_concurrency", 4))
+        self.goal_timeout = float(config.get("goal_timeout", 120))
+        self.compact_every = compact_every
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
-        self.goals = self._load()
+        self.by_id = {}
+        self.by_status = {}
+        self.journal_entries = 0
+        self.lock = threading.RLock()
+        self._load()
+
+    @property
+    def goals(self):
+        return list(self.by_id.values())
+
+    def _index(self, goal):
+        previous = self.by_id.get(goal["goal_id"])
+        if previous is not None:
+            self.by_status.get(previous.get("status"), {}).pop(goal["goal_id"], None)
+        self.by_id[goal["goal_id"]] = goal
+        self.by_status.setdefault(goal.get("status"), {})[goal["goal_id"]] = goal
 
     def _load(self):
         if os.path.exists(self.path):
             try:
                 with open(self.path, "r") as f:
-                    return json.load(f)
+                    for goal in json.load(f):
+                        self._index(goal)
             except Exception:
-                return []
-        return []
+                pass
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "r") as f:
+                for line in f:
+                    try:
+                        self._index(json.loads(line))
+                        self.journal_entries += 1
+                    except ValueError:
+                        continue  # Torn final line from an interrupted write
+
+    def _append(self, goal):
+        with open(self.journal_path, "a") as f:
+            f.write(json.dumps(goal) + "\n")
+        self.journal_entries += 1
+        if self.journal_entries >= self.compact_every:
+            self.save()
 
     def save(self):
-        with open(self.path, "w") as f:
-            json.dump(self.goals, f, indent=2)
+        with self.lock:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self.goals, f, indent=2)
+            os.replace(tmp_path, self.path)
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self.journal_entries = 0
 
-    def add_goal(self, description: str):
+    def add_goal(self, description: str, status: str = "active"):
         goal_id = "goal_" + uuid4().hex[:8]
         goal = {
             "goal_id": goal_id,
             "description": description,
             "created": datetime.utcnow().isoformat(),
-            "status": "active"
+            "status": status
         }
-        self.goals.append(goal)
-        self.memory.log("goal", f"[{goal_id}] {description}")
-        self.save()
+        with self.lock:
+            self._index(goal)
+            self._append(goal)
+        self.memory.log("goal", f"[{goal_id}] {description}", persist=False)
         return goal_id
 
+    def update_goal(self, goal_id, **fields):
+        with self.lock:
+            goal = self.by_id.get(goal_id)
+            if goal is None:
+                return None
+            goal = {**goal, **fields, "updated": datetime.utcnow().isoformat()}
+            self._index(goal)
+            self._append(goal)
+        return goal
+
     def get_active_goals(self):
-        return [g for g in self.goals if g.get("status") == "active"]
+        with self.lock:
+            return list(self.by_status.get("active", {}).values())
+
+    def get_goals_by_status(self, status):
+        with self.lock:
+            return list(self.by_status.get(status, {}).values())
 
     def get_goal_by_id(self, goal_id):
-        for goal in self.goals:
-            if goal.get("goal_id") == goal_id:
-                return goal
-        return None
+        return self.by_id.get(goal_id)
+
+    def _plan(self, goal):
+        if not self.gpt:
+            raise RuntimeError("GPT unavailable.")
+        return self.gpt.chat.completions.create(
+            messages=[
+                {"role": "system", "content": "You are a planning assistant. Evaluate this goal for LP1 and suggest steps:"},
+                {"role": "user", "content": goal["description"]}
+            ]
+        ).choices[0].message
+
+    async def _evaluate_goal(self, goal, semaphore):
+        async with semaphore:
+            try:
+                # On timeout the worker thread is abandoned, not killed; the goal stays pending.
+                result = await asyncio.wait_for(asyncio.to_thread(self._plan, goal), timeout=self.goal_timeout)
+            except Exception as e:
+                error = f"Timed out after {self.goal_timeout}s" if isinstance(e, asyncio.TimeoutError) else str(e)
+                print(f"[GoalEngine] Failed to evaluate {goal['goal_id']}: {error}")
+                await asyncio.to_thread(
+                    self.update_goal, goal["goal_id"], last_error=error, attempts=goal.get("attempts", 0) + 1
+                )
+                return False
+        # memory may be a state-service proxy, so its calls stay off the event loop too.
+        await asyncio.to_thread(self.memory.log, "goal", f"{goal['description']} -> {result}", persist=False)
+        await asyncio.to_thread(self.update_goal, goal["goal_id"], status="processed", plan=str(result))
+        return True
 
     async def evaluate(self):
-        for goal in self.goals:
-            if goal["status"] == "pending":
-                    messages=[
-                        {"role": "system", "content": "You are a planning assistant. Evaluate this goal for LP1 and suggest steps:"},
-                        {"role": "user", "content": goal["description"]}
-                    ]
-                ).choices[0].message
-                self.memory.log("goal", f"{goal['description']} -> {result}")
-                goal["status"] = "processed"
-        self.save()
+        pending = self.get_goals_by_status("pending")
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._evaluate_goal(goal, semaphore) for goal in pending))
+        processed = sum(1 for ok in results if ok)
+        if pending:
+            await asyncio.to_thread(self.memory.flush)
+            await asyncio.to_thread(self.save)
+        return {"processed": processed, "failed": len(pending) - processed}
@@ -0,0 +1,63 @@
+import importlib
+import importlib.util
+import os
+import sys
+
+def same_interface(obj):
+    """Smoke check that fails when a reload drops a public method `obj` had when registered."""
+    cls = type(obj)
+    methods = {name for name in dir(cls) if not name.startswith("_") and callable(getattr(cls, name, None))}
+
+    def check(rebound):
+        missing = sorted(name for name in methods if not callable(getattr(rebound, name, None)))
+        if missing:
+            raise AttributeError(f"{type(rebound).__name__} no longer defines {', '.join(missing)}")
+    return check
+
+class HotReloader:
+    def __init__(self, skills=None, base_dir=None):
+        self.skills = skills
+        self.base_dir = os.path.abspath(base_dir or os.getcwd())
+        self.objects = []
+
+    def register(self, obj, smoke=None):
+        """Tracks a live core object so reloads of its module rebind it in place."""
+        self.objects.append((obj, smoke))
+        return obj
+
+    def module_name(self, path: str) -> str:
+        rel_path = os.path.relpath(os.path.abspath(path), self.base_dir)
+        if rel_path.startswith("..") or not rel_path.endswith(".py"):
+            raise ValueError(f"{path} is not a module under {self.base_dir}")
+        name = rel_path[:-3].replace(os.sep, ".")
+        return name[:-len(".__init__")] if name.endswith(".__init__") else name
+
+    def reload_path(self, path: str):
+        name = self.module_name(path)
+        # Bytecode is validated by mtime and size, which a same-second rewrite can fool.
+        cached = importlib.util.cache_from_source(os.path.abspath(path))
+        if os.path.exists(cached):
+            os.remove(cached)
+        importlib.invalidate_caches()
+        module = sys.modules.get(name)
+        module = importlib.reload(module) if module is not None else importlib.import_module(name)
+        return self._rebind(module)
+
+    def _rebind(self, module):
+        rebound = []
+        # Swapping __class__ keeps instance state (loaded models, indexes, memory) intact.
+        for obj, smoke in self.objects:
+            cls = type(obj)
+            if cls.__module__ != module.__name__:
+                continue
+            new_cls = getattr(module, cls.__name__, None)
+            if new_cls is None:
+                raise AttributeError(f"{module.__name__} no longer defines {cls.__name__}")
+            obj.__class__ = new_cls
+            if smoke:
+                smoke(obj)
+            rebound.append(cls.__name__)
+
+        if self.skills is not None and module.__name__.startswith("skills."):
+            rebound.extend(self.skills.reload_module(module))
+        return rebound
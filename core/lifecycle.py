@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+class Component:
+    def __init__(self, name, factory, deps=(), warmup=None, close=None):
+        self.name = name
+        self.factory = factory
+        self.deps = tuple(deps)
+        self.warmup = warmup
+        self.close = close
+
+class ComponentRegistry:
+    """Builds components lazily and concurrently (each factory runs in a worker thread)."""
+
+    def __init__(self, warmup: bool = False):
+        self.warmup = warmup
+        self.components = {}
+        self.instances = {}
+        self.report = {}
+        self._tasks = {}
+
+    def register(self, name, factory, deps=(), warmup=None, close=None):
+        self.components[name] = Component(name, factory, deps, warmup, close)
+
+    async def get(self, name):
+        if name in self.instances:
+            return self.instances[name]
+        task = self._tasks.get(name)
+        if task is None:
+            task = self._tasks[name] = asyncio.create_task(self._build(self.components[name]))
+        return await asyncio.shield(task)
+
+    async def _build(self, component):
+        deps = await asyncio.gather(*(self.get(dep) for dep in component.deps))
+        entry = self.report[component.name] = {"status": "starting"}
+        start = time.perf_counter()
+        try:
+            instance = await asyncio.to_thread(component.factory, *deps)
+            entry["init_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            if self.warmup and component.warmup:
+                warm_start = time.perf_counter()
+                await asyncio.to_thread(component.warmup, instance)
+                entry["warmup_ms"] = round((time.perf_counter() - warm_start) * 1000, 1)
+        except Exception as e:
+            entry.update(status="failed", error=str(e))
+            print(f"[Startup] {component.name} failed: {e}")
+            raise
+        entry["status"] = "ready"
+        self.instances[component.name] = instance
+        return instance
+
+    async def start_all(self):
+        start = time.perf_counter()
+        results = await asyncio.gather(*(self.get(name) for name in self.components), return_exceptions=True)
+        total = round((time.perf_counter() - start) * 1000, 1)
+        summary = ", ".join(f"{name}={entry.get('init_ms', '-')}ms" for name, entry in self.report.items())
+        print(f"[Startup] {'Ready' if self.ready else 'Degraded'} in {total}ms ({summary})")
+        return [r for r in results if isinstance(r, Exception)]
+
+    @property
+    def ready(self):
+        return len(self.instances) == len(self.components)
+
+    async def shutdown(self):
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+        for name, instance in reversed(list(self.instances.items())):
+            close = self.components[name].close
+            if close:
+                try:
+                    await asyncio.to_thread(close, instance)
+                except Exception as e:
+                    print(f"[Shutdown] {name} failed to close: {e}")
@@ -1,36 +1,137 @@
 import shutil
 import os
-from datetime import datetime
-import subprocess
+import importlib
 import tempfile
+import textwrap
+import types
+from datetime import datetime
+from core.code_index import parse_source
+from core.profiler import ab_compare
+from core.syntax_validator import check_source
 
 class LiveSwapper:
-    def __init__(self, log_dir="./data/rewrites"):
+    def __init__(self, log_dir="./data/rewrites", reloader=None, index=None):
         self.log_dir = log_dir
+        self.reloader = reloader
+        self.index = index
         os.makedirs(log_dir, exist_ok=True)
 
     def backup(self, target_file):
-        stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        stamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")
         backup_path = os.path.join(self.log_dir, os.path.basename(target_file) + f".{stamp}.bak")
         shutil.copyfile(target_file, backup_path)
         return backup_path
 
-    def test_patch(self, new_code):
-        with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as tmp:
-            tmp.write(new_code)
-            tmp_path = tmp.name
+    def test_patch(self, new_code, filename="<patch>"):
+        return check_source(new_code, filename)["ok"]
+
+    def write_atomic(self, target_file, content):
+        directory = os.path.dirname(os.path.abspath(target_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".lp1_swap_", suffix=".tmp")
         try:
-            subprocess.run(["python3", "-m", "py_compile", tmp_path], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            os.remove(tmp_path)
-            return True
-        except subprocess.CalledProcessError:
-            os.remove(tmp_path)
-            return False
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            if os.path.exists(target_file):
+                shutil.copymode(target_file, tmp_path)
+            os.replace(tmp_path, target_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def rollback(self, target_file, backup_path):
+        with open(backup_path, "r", encoding="utf-8") as f:
+            self.write_atomic(target_file, f.read())
+        if self.reloader is not None:
+            self.reloader.reload_path(target_file)
 
     def apply(self, target_file, new_code):
-        if not self.test_patch(new_code):
+        if not self.test_patch(new_code, target_file):
             return "Patch failed syntax validation."
-        self.backup(target_file)
-        with open(target_file, "w", encoding="utf-8") as f:
-            f.write(new_code)
-        return "Patch successfully applied and backup created."
+        backup_path = self.backup(target_file)
+        self.write_atomic(target_file, new_code)
+        if self.reloader is None:
+            return "Patch successfully applied and backup created."
+
+        try:
+            rebound = self.reloader.reload_path(target_file)
+        except Exception as e:
+            try:
+                self.rollback(target_file, backup_path)
+            except Exception as rollback_error:
+                return f"Hot reload failed ({e}) and rollback failed: {rollback_error}"
+            return f"Hot reload failed, restored {os.path.basename(backup_path)}: {e}"
+        return f"Patch applied and hot-reloaded ({', '.join(rebound) or 'no live objects'}). Backup created."
+
+    def reload(self, target_file):
+        """Hot-reloads a module that changed on disk outside apply() (e.g. a git patch)."""
+        if self.reloader is None:
+            return "Hot reload is not configured."
+        try:
+            rebound = self.reloader.reload_path(target_file)
+        except Exception as e:
+            return f"Hot reload of {target_file} failed: {e}"
+        return f"Hot-reloaded {os.path.basename(target_file)} ({', '.join(rebound) or 'no live objects'})."
+
+    def _module_name(self, target_file):
+        if self.reloader is not None:
+            return self.reloader.module_name(target_file)
+        rel_path = os.path.relpath(os.path.abspath(target_file), os.getcwd())
+        return rel_path[:-3].replace(os.sep, ".")
+
+    def _resolve(self, namespace, qualname):
+        obj = namespace
+        for part in qualname.split("."):
+            obj = getattr(obj, part)
+        return obj
+
+    def _span(self, target_file, source, function):
+        if self.index is not None:
+            self.index.refresh()  # incremental; keeps line numbers in step with the file
+            fn = self.index.find(target_file, function)
+        else:
+            fn = next((f for f in parse_source(source, target_file)["functions"] if function in (f["qualname"], f["function"])), None)
+        if fn is None:
+            raise ValueError(f"Function '{function}' not found in {target_file}")
+        return fn["lineno"], fn["end_lineno"]
+
+    def splice(self, target_file, function, new_function_source):
+        """Returns the module text with `function` (decorators included) replaced by the new source."""
+        with open(target_file, "r", encoding="utf-8") as f:
+            source = f.read()
+        start, end = self._span(target_file, source, function)
+        lines = source.splitlines(keepends=True)
+        original = lines[start - 1]
+        indent = original[:len(original) - len(original.lstrip())]
+        replacement = textwrap.indent(textwrap.dedent(new_function_source).strip("\n") + "\n", indent)
+        return "".join(lines[:start - 1]) + replacement + "".join(lines[end:])
+
+    def benchmark(self, target_file, new_code, function, args=(), kwargs=None, repeat=5):
+        module_name = self._module_name(target_file)
+        baseline = self._resolve(importlib.import_module(module_name), function)
+        candidate_module = types.ModuleType(module_name)
+        candidate_module.__file__ = os.path.abspath(target_file)
+        exec(compile(new_code, target_file, "exec"), candidate_module.__dict__)
+        candidate = self._resolve(candidate_module, function)
+        return ab_compare(baseline, candidate, args=args, kwargs=kwargs, repeat=repeat)
+
+    def apply_if_faster(self, target_file, new_function_source, function, args=(), kwargs=None, min_speedup=1.05):
+        # CodeRewriter returns only the rewritten function; benchmark and apply the full module.
+        try:
+            new_code = self.splice(target_file, function, new_function_source)
+        except ValueError as e:
+            return f"Rewrite of {function} rejected: {e}"
+        if not self.test_patch(new_code, target_file):
+            return "Patch failed syntax validation."
+        try:
+            result = self.benchmark(target_file, new_code, function, args=args, kwargs=kwargs)
+        except Exception as e:
+            return f"A/B check failed: {e}"
+        if not result["same_result"]:
+            return f"Rewrite of {function} rejected: results differ from the current version."
+        if result["speedup"] < min_speedup:
+            return f"Rewrite of {function} rejected: {result['speedup']:.2f}x is below the {min_speedup:.2f}x threshold."
+        outcome = self.apply(target_file, new_code)
+        return f"{outcome} ({function}: {result['speedup']:.2f}x faster)"
@@ -1,6 +1,8 @@
 
 import os
+import time
 from llama_cpp import Llama
+from core.metrics import metrics
 
 class LP1Router:
     def __init__(self, model_dir="models"):
@@ -16,17 +18,41 @@ class LP1Router:
         }
         self.llms = {k: Llama(model_path=v, n_ctx=self.context_sizes[k]) for k, v in self.models.items()}
 
-    def choose_model(self, user_input):
+    def warmup(self, max_tokens: int = 4):
+        # One short generation per model pages in the weights and builds the compute
+        # graph, so the first real request doesn't pay for it.
+        for llm in self.llms.values():
+            llm("Hello", max_tokens=max_tokens, echo=False)
+
+    def choose_model_name(self, user_input):
         length = len(user_input)
         if length < 100:
-            return self.llms["tiny"]
+            return "tiny"
         elif length < 400:
-            return self.llms["phi"]
+            return "phi"
         else:
-            return self.llms["mistral"]
+            return "mistral"
+
+    def choose_model(self, user_input):
+        return self.llms[self.choose_model_name(user_input)]
 
     def run(self, user_input, context):
-        model = self.choose_model(user_input)
+        name = self.choose_model_name(user_input)
+        model = self.llms[name]
         prompt = f"{context}\n\nUser: {user_input}\nLP1:"
-        output = model(prompt, max_tokens=512, stop=["User:"], echo=False)
-        return output["choices"][0]["text"].strip()
+
+        # Streaming lets us split prompt evaluation (time to first token) from generation.
+        start = time.perf_counter()
+        first_token = None
+        pieces = []
+        for chunk in model(prompt, max_tokens=512, stop=["User:"], echo=False, stream=True):
+            if first_token is None:
+                first_token = time.perf_counter()
+            pieces.append(chunk["choices"][0]["text"])
+        end = time.perf_counter()
+        first_token = first_token or end
+
+        metrics.observe("llm_prompt_eval", first_token - start, model=name)
+        metrics.observe("llm_generation", end - first_token, model=name)
+        metrics.inc("lp1_llm_tokens_total", len(pieces), help_text="Tokens generated per model.", model=name)
+        return "".join(pieces).strip()
@@ -0,0 +1,264 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+
+# Prompt mix: skill triggers, light (retrieval-only) queries, and prompts that match
+# no skill and are answered by the local models. Skills match triggers by substring,
+# so these avoid accidental hits such as "no" inside "know".
+PROMPTS = {
+    "skill": ["system status", "set a goal to learn rust ownership rules", "your goal is to ship the batch api"],
+    "light": ["recall python generators", "tell me what you learned about event loops", "recall faiss index types"],
+    "llm": ["summarize what a vector index does", "write a haiku about event loops " * 8],
+}
+EXPECTED_SKILLS = {"skill": {"diagnostics", "goal_setter"}, "light": {"knowledge_recaller"}, "llm": {None}}
+DEFAULT_MIX = {"skill": 3, "light": 4, "llm": 3}
+
+class FakeSentenceTransformer:
+    """Stand-in embedding model: deterministic vectors plus a configurable blocking delay."""
+
+    latency = 0.01
+    per_item = 0.001
+    dim = 384
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def _vector(self, text):
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+        vec = np.random.default_rng(seed).standard_normal(self.dim).astype(np.float32)
+        return vec / np.linalg.norm(vec)
+
+    def encode(self, sentences, convert_to_tensor=False, batch_size=32, **kwargs):
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        time.sleep(self.latency + self.per_item * len(texts))
+        vectors = np.stack([self._vector(t) for t in texts]) if texts else np.zeros((0, self.dim), np.float32)
+        result = vectors[0] if single else vectors
+        if convert_to_tensor:
+            import torch
+            return torch.from_numpy(result)
+        return result
+
+class FakeLlama:
+    """Stand-in for llama_cpp.Llama: sleeps for prompt evaluation, then streams tokens."""
+
+    prompt_latency = 0.05
+    token_latency = 0.005
+    tokens = 32
+
+    def __init__(self, model_path=None, n_ctx=2048, **kwargs):
+        self.model_path = model_path
+        self.n_ctx = n_ctx
+
+    def _stream(self):
+        time.sleep(self.prompt_latency)
+        for i in range(self.tokens):
+            time.sleep(self.token_latency)
+            yield {"choices": [{"text": f" tok{i}"}]}
+
+    def __call__(self, prompt, max_tokens=512, stop=None, echo=False, stream=False, **kwargs):
+        chunks = self._stream()
+        if stream:
+            return chunks
+        return {"choices": [{"text": "".join(c["choices"][0]["text"] for c in chunks)}]}
+
+def install_stand_ins(embed_latency: float, llm_prompt_latency: float, llm_token_latency: float, llm_tokens: int):
+    # Patch the classes on the real packages before any LP1 module imports them.
+    import llama_cpp
+    import sentence_transformers
+
+    FakeSentenceTransformer.latency = embed_latency
+    FakeLlama.prompt_latency = llm_prompt_latency
+    FakeLlama.token_latency = llm_token_latency
+    FakeLlama.tokens = llm_tokens
+    sentence_transformers.SentenceTransformer = FakeSentenceTransformer
+    llama_cpp.Llama = FakeLlama
+
+def parse_mix(text: str):
+    mix = dict(DEFAULT_MIX)
+    for part in filter(None, (p.strip() for p in (text or "").split(","))):
+        kind, _, weight = part.partition("=")
+        if kind not in PROMPTS:
+            raise ValueError(f"Unknown prompt kind '{kind}'. Expected one of: {', '.join(PROMPTS)}")
+        mix[kind] = float(weight)
+    if not any(mix.values()):
+        raise ValueError("Prompt mix has no positive weights.")
+    return mix
+
+def misrouted(skills, mix):
+    """Prompts in the mix that would not reach the code path their kind is meant to load."""
+    return [
+        (kind, prompt, skills.match(prompt))
+        for kind, weight in mix.items() if weight > 0
+        for prompt in PROMPTS[kind]
+        if skills.match(prompt) not in EXPECTED_SKILLS[kind]
+    ]
+
+def percentile(values, pct: float):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+def summarize(samples, duration: float):
+    """samples: list of (kind, latency_seconds, ok)."""
+    def block(rows):
+        latencies = [latency for _, latency, _ in rows]
+        errors = sum(1 for _, _, ok in rows if not ok)
+        return {
+            "requests": len(rows),
+            "throughput_rps": round(len(rows) / duration, 2) if duration else 0.0,
+            "error_rate": round(errors / len(rows), 4) if rows else 0.0,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+            "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        }
+
+    report = {"all": block(samples)}
+    for kind in sorted({kind for kind, _, _ in samples}):
+        report[kind] = block([s for s in samples if s[0] == kind])
+    return report
+
+class LoopLagMonitor:
+    """Measures how late a periodic timer fires; anything blocking the loop shows up as lag."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.lags = []
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval))
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        return {
+            "p50_ms": round(percentile(self.lags, 50) * 1000, 2),
+            "p99_ms": round(percentile(self.lags, 99) * 1000, 2),
+            "max_ms": round(max(self.lags, default=0.0) * 1000, 2),
+        }
+
+async def _request(client, kind, prompt, samples):
+    start = time.perf_counter()
+    ok = False
+    try:
+        response = await client.post("/ask", json={"input": prompt})
+        ok = response.status_code == 200 and "error" not in response.json()
+    except Exception:
+        ok = False
+    samples.append((kind, time.perf_counter() - start, ok))
+
+async def run_load(app, mix, duration: float, rate: float = None, concurrency: int = 8, seed: int = 0):
+    """Open loop when `rate` is set (requests/s regardless of latency), closed loop otherwise."""
+    import httpx
+
+    rng = random.Random(seed)
+    kinds = [k for k, w in mix.items() if w > 0]
+    weights = [mix[k] for k in kinds]
+
+    def pick():
+        kind = rng.choices(kinds, weights)[0]
+        return kind, rng.choice(PROMPTS[kind])
+
+    samples = []
+    monitor = LoopLagMonitor()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://lp1", timeout=None) as client:
+        monitor.start()
+        start = time.perf_counter()
+        deadline = start + duration
+        if rate:
+            pending = []
+            next_at = start
+            while next_at < deadline:
+                await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+                pending.append(asyncio.create_task(_request(client, *pick(), samples)))
+                next_at += 1.0 / rate
+            await asyncio.gather(*pending)
+        else:
+            async def worker():
+                while time.perf_counter() < deadline:
+                    await _request(client, *pick(), samples)
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        lag = await monitor.stop()
+
+    report = summarize(samples, elapsed)
+    report["event_loop_lag"] = lag
+    report["duration_s"] = round(elapsed, 2)
+    return report
+
+def _isolate_data(data_dir: str):
+    # Keep load-test writes out of the real memory, goal and feedback files.
+    os.environ["LP1_DATA_PATH"] = data_dir
+    os.environ["LP1_MEMORY_FILE"] = os.path.join(data_dir, "lp1_memory.json")
+    os.environ["LP1_VECTOR_STORE"] = os.path.join(data_dir, "knowledge_vectors.faiss")
+    os.environ["LP1_FEEDBACK_LOG"] = os.path.join(data_dir, "feedback.jsonl")
+    os.environ["LP1_PROFILE_REPORT"] = os.path.join(data_dir, "hot_paths.json")
+    os.environ.pop("LP1_STATE_SOCKET", None)
+
+async def _main(args):
+    mix = parse_mix(args.mix)
+    if args.local_models:
+        os.environ["LP1_LOCAL_MODELS"] = "1"
+    elif mix.get("llm"):
+        print("[LoadTest] Dropping 'llm' prompts: pass --local-models to route them to the stand-in Llama.")
+        mix["llm"] = 0
+
+    install_stand_ins(args.embed_latency, args.llm_prompt_latency, args.llm_token_latency, args.llm_tokens)
+    with tempfile.TemporaryDirectory() as data_dir:
+        _isolate_data(data_dir)
+        import web_server
+
+        async with web_server.lifespan(web_server.app):
+            for name in web_server.registry.components:
+                await web_server.registry.get(name)
+            for kind, prompt, skill in misrouted(web_server.registry.instances["skills"], mix):
+                print(f"[LoadTest] Warning: {kind} prompt '{prompt[:40]}' routes to {skill or 'no skill'}.")
+            report = await run_load(web_server.app, mix, args.duration, args.rate, args.concurrency, args.seed)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    mode = f"{args.rate} req/s open loop" if args.rate else f"{args.concurrency} workers closed loop"
+    print(f"[LoadTest] {report['duration_s']}s, {mode}")
+    print(f"{'kind':<10}{'requests':>10}{'rps':>10}{'errors':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for kind, row in report.items():
+        if isinstance(row, dict) and "requests" in row:
+            print(f"{kind:<10}{row['requests']:>10}{row['throughput_rps']:>10}{row['error_rate']:>9.2%}"
+                  f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+    lag = report["event_loop_lag"]
+    print(f"event loop lag: p50 {lag['p50_ms']}ms, p99 {lag['p99_ms']}ms, max {lag['max_ms']}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay a prompt mix against web_server.app with stand-in models.")
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--rate", type=float, help="Target requests/s (open loop). Omit for a fixed-concurrency closed loop.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--mix", default="", help="Weights per prompt kind, e.g. skill=3,light=4,llm=1")
+    parser.add_argument("--local-models", action="store_true", help="Load the router so unmatched 'llm' prompts hit the stand-in Llama.")
+    parser.add_argument("--embed-latency", type=float, default=0.01)
+    parser.add_argument("--llm-prompt-latency", type=float, default=0.05)
+    parser.add_argument("--llm-token-latency", type=float, default=0.005)
+    parser.add_argument("--llm-tokens", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    try:
+        asyncio.run(_main(parser.parse_args()))
+    except ValueError as e:
+        sys.exit(f"[LoadTest] {e}")
@@ -1,13 +1,11 @@
 
-from core.context_builder import build_context
 from core.llm_router import LP1Router
 
 class LP1LocalModel:
     def __init__(self):
         self.router = LP1Router()
 
-    def run_inference(self, user_input):
-        context = build_context()
+    def run_inference(self, user_input, context=""):
         return self.router.run(user_input, context)
 
 if __name__ == "__main__":
@@ -1,16 +1,31 @@
 
 import os
 import json
+import re
+import threading
 import time
 from datetime import datetime
 from sentence_transformers import SentenceTransformer, util
 from uuid import uuid4
+from core.dedup import Deduplicator
+from core.metrics import metrics
+from core.text_index import BM25Index, keyword_confident, reciprocal_rank_fusion
 
 class MemoryManager:
     def __init__(self, config):
         self.path = config["memory_file"]
+        # Guards the entry list and its indexes; encodes run outside it so several
+        # threads (e.g. state-service clients) can embed at the same time.
+        self.lock = threading.RLock()
         os.makedirs(os.path.dirname(self.path), exist_ok=True)
         self.memory = self._load()
+        self.by_id = {}
+        self.text_index = BM25Index()
+        self.dedup = Deduplicator(config.get("dedup_policies"))
+        for entry in self.memory:
+            entry.setdefault("id", uuid4().hex[:12])
+            self._index(entry)
+        self.dirty = False
         self.session_id = uuid4().hex  # New session ID for current boot
         self.embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
 
@@ -26,41 +41,159 @@ class MemoryManager:
     def save(self):
         try:
             print(f"[MemoryManager] Saving memory to: {self.path}")
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self.memory, f, indent=2)
+            with self.lock, metrics.timer("persist", component="memory"):
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(self.memory, f, indent=2)
+                self.dirty = False
         except Exception as e:
             print(f"[MemoryManager] Save failed: {e}")
 
-    def log(self, role: str, content: str):
-        embedding = self.embedding_model.encode(content, convert_to_tensor=True).tolist()
+    def flush(self):
+        if self.dirty:
+            self.save()
+
+    def _index(self, entry: dict):
+        self.by_id[entry["id"]] = entry
+        if entry.get("content"):
+            self.text_index.add(entry["id"], entry["content"])
+        self.dedup.track(entry)
+
+    def add(self, entry: dict, persist: bool = True):
+        entry.setdefault("id", uuid4().hex[:12])
+        entry.setdefault("timestamp", datetime.utcnow().isoformat())
+        entry.setdefault("session_id", self.session_id)
+        with self.lock:
+            self.memory.append(entry)
+            self._index(entry)
+        if persist:
+            self.save()
+        else:
+            self.dirty = True
+        return entry["id"]
+
+    def _merge(self, existing: dict, content: str, kind: str, persist: bool):
+        with self.lock:
+            self.dedup.merge(existing, content, kind)
+        print(f"[MemoryManager] Merged {kind} duplicate into {existing['id']} (hits={existing['hits']})")
+        if persist:
+            self.save()
+        else:
+            self.dirty = True
+        return existing["id"]
+
+    def log(self, role: str, content: str, persist: bool = True, **fields):
+        with self.lock:
+            duplicate = self.dedup.find_exact(role, content, session_id=self.session_id)
+        if duplicate is not None:
+            return self._merge(duplicate, content, "exact", persist)
+
+        with metrics.timer("encode", component="memory"):
+            embedding = self.embedding_model.encode(content, convert_to_tensor=True).tolist()
+        with self.lock:
+            duplicate = self.dedup.find_similar(role, embedding, topic=fields.get("goal_id"), session_id=self.session_id)
+        if duplicate is not None:
+            return self._merge(duplicate, content, "near", persist)
+
         entry = {
+            "id": uuid4().hex[:12],
             "timestamp": datetime.utcnow().isoformat(),
             "role": role,
             "content": content,
             "embedding": embedding,
-            "session_id": self.session_id
+            "session_id": self.session_id,
+            **fields
         }
         print(f"[MemoryManager] Logging new memory entry: role={role}, content preview={content[:60]}")
-        self.memory.append(entry)
-        self.save()
+        return self.add(entry, persist=persist)
+
+    def get(self, entry_id: str):
+        return self.by_id.get(entry_id)
+
+    def active_goal_id(self):
+        """Goal id tagged on the most recent goal entry of this session, if any."""
+        with self.lock:
+            entries = list(self.memory)
+        for entry in reversed(entries):
+            if entry.get("role") == "goal" and entry.get("session_id") == self.session_id:
+                match = re.search(r"\[(goal_[a-z0-9]+)\]", entry.get("content", ""))
+                if match:
+                    return match.group(1)
+        return None
+
+    def _snapshot(self):
+        with self.lock:
+            return list(self.memory)
+
+    def dedup_stats(self):
+        return self.dedup.stats
 
     def recall(self, query: str, limit: int = 5):
         if not self.memory:
             return []
 
-        query_vec = self.embedding_model.encode(query, convert_to_tensor=True)
+        with metrics.timer("encode", component="memory"):
+            query_vec = self.embedding_model.encode(query, convert_to_tensor=True)
         scored = []
 
-        for entry in self.memory:
-            if entry.get("session_id") != self.session_id:
-                continue
-            if "embedding" not in entry:
-                continue
-            try:
-                score = util.cos_sim(query_vec, entry["embedding"])[0][0].item()
-                scored.append((score, entry))
-            except Exception:
-                continue
-
-        scored.sort(reverse=True, key=lambda x: x[0])
+        with metrics.timer("recall", component="memory"):
+            for entry in self._snapshot():
+                if entry.get("session_id") != self.session_id:
+                    continue
+                if "embedding" not in entry:
+                    continue
+                try:
+                    score = util.cos_sim(query_vec, entry["embedding"])[0][0].item()
+                    scored.append((score, entry))
+                except Exception:
+                    continue
+
+            scored.sort(reverse=True, key=lambda x: x[0])
         return [entry for _, entry in scored[:limit]]
+
+    def recall_many(self, queries, limit: int = 5):
+        # One batched encode and one similarity matrix for the whole batch.
+        entries = [e for e in self._snapshot() if e.get("session_id") == self.session_id and "embedding" in e]
+        if not queries or not entries:
+            return [[] for _ in queries]
+
+        with metrics.timer("encode", component="memory", batch=True):
+            query_vecs = self.embedding_model.encode(list(queries), convert_to_tensor=True)
+        with metrics.timer("recall", component="memory", batch=True):
+            scores = util.cos_sim(query_vecs, [e["embedding"] for e in entries])
+            top = scores.topk(min(limit, len(entries)), dim=1).indices.tolist()
+        return [[entries[i] for i in row] for row in top]
+
+    def hybrid_search(self, query: str, limit: int = 5, roles=None, session_only: bool = False):
+        def accept(entry):
+            if roles is not None and entry.get("role") not in roles:
+                return False
+            return not session_only or entry.get("session_id") == self.session_id
+
+        with self.lock, metrics.timer("keyword_search", component="memory"):
+            keyword = self.text_index.search(query, limit=limit * 4, accept=lambda i: accept(self.by_id[i]))
+        bm25 = dict(keyword)
+        if keyword_confident(keyword):
+            # Exact identifiers and error strings: skip the embedding encode entirely.
+            metrics.inc("lp1_keyword_fast_path_total", help_text="Hybrid queries answered by BM25 alone.", component="memory")
+            return [{"entry": self.by_id[i], "score": s, "bm25": s, "cosine": None, "fast_path": True}
+                    for i, s in keyword[:limit]]
+
+        with metrics.timer("encode", component="memory"):
+            query_vec = self.embedding_model.encode(query, convert_to_tensor=True)
+        cosine = {}
+        with metrics.timer("recall", component="memory"):
+            for entry in self._snapshot():
+                if "embedding" not in entry or not accept(entry):
+                    continue
+                try:
+                    cosine[entry["id"]] = util.cos_sim(query_vec, entry["embedding"])[0][0].item()
+                except Exception:
+                    continue
+        vector = sorted(cosine, key=cosine.get, reverse=True)[:limit * 4]
+
+        fused = reciprocal_rank_fusion([[i for i, _ in keyword], vector])
+        return [{"entry": self.by_id[i], "score": s, "bm25": bm25.get(i), "cosine": cosine.get(i), "fast_path": False}
+                for i, s in fused[:limit]]
+
+    def hybrid_recall(self, query: str, limit: int = 5, roles=None, session_only: bool = False):
+        return [r["entry"] for r in self.hybrid_search(query, limit=limit, roles=roles, session_only=session_only)]
@@ -0,0 +1,164 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+STAGE_HISTOGRAM = "lp1_stage_duration_seconds"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_request_timings = contextvars.ContextVar("lp1_request_timings", default=None)
+
+def _label_key(labels: dict):
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.series = {}
+
+    def observe(self, value: float, key):
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series["buckets"][i] += 1
+        series["sum"] += value
+        series["count"] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self.series.items()):
+            for bound, count in zip(self.buckets, series["buckets"]):
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', bound)])} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {series['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.series = {}
+
+    def inc(self, amount: float, key):
+        self.series[key] = self.series.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self.series.items()):
+            lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {
+            STAGE_HISTOGRAM: Histogram(STAGE_HISTOGRAM, "Time spent per processing stage.")
+        }
+        self.counters = {}
+
+    def observe(self, stage: str, seconds: float, **labels):
+        key = _label_key({"stage": stage, **labels})
+        with self.lock:
+            self.histograms[STAGE_HISTOGRAM].observe(seconds, key)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append({"stage": stage, **labels, "ms": round(seconds * 1000, 3)})
+
+    @contextmanager
+    def timer(self, stage: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, **labels)
+
+    def inc(self, name: str, amount: float = 1, help_text: str = "", **labels):
+        with self.lock:
+            counter = self.counters.get(name)
+            if counter is None:
+                counter = self.counters[name] = Counter(name, help_text or name.replace("_", " "))
+            counter.inc(amount, _label_key(labels))
+
+    def render(self) -> str:
+        with self.lock:
+            lines = []
+            for metric in list(self.histograms.values()) + list(self.counters.values()):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> dict:
+        """JSON-serializable copy of every series, for merging in another process."""
+        with self.lock:
+            return {
+                "histograms": {
+                    name: {"help": h.help_text, "buckets": list(h.buckets),
+                           "series": [[list(key), {**s, "buckets": list(s["buckets"])}] for key, s in h.series.items()]}
+                    for name, h in self.histograms.items()
+                },
+                "counters": {
+                    name: {"help": c.help_text, "series": [[list(key), value] for key, value in c.series.items()]}
+                    for name, c in self.counters.items()
+                }
+            }
+
+    def merge(self, snapshot: dict):
+        # Histograms and counters are additive, so series with equal labels are summed.
+        with self.lock:
+            for name, data in snapshot.get("histograms", {}).items():
+                histogram = self.histograms.setdefault(name, Histogram(name, data["help"], data["buckets"]))
+                if list(histogram.buckets) != list(data["buckets"]):
+                    continue
+                for key, series in data["series"]:
+                    key = tuple(tuple(pair) for pair in key)
+                    target = histogram.series.setdefault(key, {"buckets": [0] * len(histogram.buckets), "sum": 0.0, "count": 0})
+                    target["buckets"] = [a + b for a, b in zip(target["buckets"], series["buckets"])]
+                    target["sum"] += series["sum"]
+                    target["count"] += series["count"]
+            for name, data in snapshot.get("counters", {}).items():
+                counter = self.counters.setdefault(name, Counter(name, data["help"]))
+                for key, value in data["series"]:
+                    counter.inc(value, tuple(tuple(pair) for pair in key))
+
+class MetricsAggregator:
+    """Lives in the state service: merges its own metrics with snapshots pushed by HTTP workers."""
+
+    def __init__(self, registry: MetricsRegistry):
+        self.registry = registry
+        self.snapshots = {}
+        self.lock = threading.Lock()
+
+    def push(self, source: str, snapshot: dict):
+        with self.lock:
+            self.snapshots[source] = snapshot
+
+    def render(self) -> str:
+        merged = MetricsRegistry()
+        merged.merge(self.registry.snapshot())
+        with self.lock:
+            snapshots = list(self.snapshots.values())
+        for snapshot in snapshots:
+            merged.merge(snapshot)
+        return merged.render()
+
+@contextmanager
+def request_timings():
+    # Collects every stage observed in this context (including asyncio.to_thread calls).
+    timings = []
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+metrics = MetricsRegistry()
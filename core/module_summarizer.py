@@ -1,12 +1,14 @@
 
 import os
+from core.code_index import CodeIndex
 
-def summarize_modules(path="core"):
+def summarize_modules(path="core", index=None):
+    index = index or CodeIndex(path)
+    index.refresh()
     summaries = {}
-    for filename in os.listdir(path):
-        if filename.endswith(".py"):
-            with open(os.path.join(path, filename), "r") as f:
-                lines = f.readlines()
-                doc = lines[0].strip() if lines and lines[0].startswith('"""') else "No docstring."
-                summaries[filename] = doc
+    for file_path, entry in index.entries().items():
+        if os.path.dirname(file_path) != index.base_dir:
+            continue
+        doc = entry.get("module_doc", "").strip()
+        summaries[os.path.basename(file_path)] = doc.splitlines()[0] if doc else "No docstring."
     return summaries
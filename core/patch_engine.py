@@ -1,7 +1,7 @@
 import os
 import subprocess
-import tempfile
-import shutil
+from core.syntax_validator import files_touched_by_patch, validate_workspace
+from core.workspace import check_patch, isolated_workspace
 
 class PatchEngine:
     def __init__(self, config):
@@ -11,13 +11,17 @@ class PatchEngine:
     def validate_patch(self) -> bool:
         if not os.path.exists(self.patch_path):
             return False
-        with tempfile.TemporaryDirectory() as tmp:
-            temp_repo = os.path.join(tmp, "test_repo")
-            shutil.copytree(self.base_dir, temp_repo, dirs_exist_ok=True)
+        ok, _ = check_patch(self.base_dir, self.patch_path)
+        if not ok:
+            return False
+        with open(self.patch_path, "r", encoding="utf-8") as f:
+            patch_text = f.read()
+        # Only the files the patch touches need to exist for the trial apply.
+        touched = [p for p in files_touched_by_patch(patch_text, include_sources=True) if os.path.isfile(os.path.join(self.base_dir, p))]
+        with isolated_workspace(self.base_dir, files=touched) as temp_repo:
             try:
-                subprocess.run(["git", "-C", temp_repo, "apply", self.patch_path], check=True)
-                result = subprocess.run(["python3", "-m", "py_compile", temp_repo], capture_output=True)
-                return result.returncode == 0
+                subprocess.run(["git", "-C", temp_repo, "apply", os.path.abspath(self.patch_path)], check=True)
+                return validate_workspace(temp_repo, patch_text)["ok"]
             except Exception:
                 return False
 
@@ -1,33 +1,40 @@
 import os
-import shutil
-import tempfile
 import subprocess
-from pathlib import Path
+from core.syntax_validator import validate_workspace
+from core.workspace import check_patch, isolated_workspace
 
 class PatchValidator:
     def __init__(self, base_dir):
         self.base_dir = base_dir
 
-    def simulate_and_validate(self, patch_path):
-        if not os.path.exists(patch_path):
-            return "[Validator] Patch file not found."
+    def validate(self, patch_path, run_tests=False):
+        ok, error = check_patch(self.base_dir, patch_path)
+        if not ok:
+            return {"ok": False, "apply_error": error, "touched": [], "files": [], "tests": None}
 
-        with tempfile.TemporaryDirectory() as tmp:
-            temp_repo = os.path.join(tmp, "test_repo")
-            shutil.copytree(self.base_dir, temp_repo, dirs_exist_ok=True)
+        with open(patch_path, "r", encoding="utf-8") as f:
+            patch_text = f.read()
 
+        with isolated_workspace(self.base_dir) as temp_repo:
             try:
-                subprocess.run(["git", "-C", temp_repo, "apply", patch_path], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                subprocess.run(["git", "-C", temp_repo, "apply", os.path.abspath(patch_path)], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
             except subprocess.CalledProcessError as e:
-                return f"[Validator] Patch failed to apply: {e.stderr.decode()}"
+                return {"ok": False, "apply_error": e.stderr.decode(), "touched": [], "files": [], "tests": None}
+            report = validate_workspace(temp_repo, patch_text, run_tests=run_tests)
+        report["apply_error"] = None
+        return report
+
+    def simulate_and_validate(self, patch_path, run_tests=False):
+        if not os.path.exists(patch_path):
+            return "[Validator] Patch file not found."
 
-            errors = []
-            for py_file in Path(temp_repo).rglob("*.py"):
-                try:
-                    subprocess.run(["python3", "-m", "py_compile", str(py_file)], check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                except subprocess.CalledProcessError as e:
-                    errors.append((str(py_file), e.stderr.decode()))
+        report = self.validate(patch_path, run_tests=run_tests)
+        if report["apply_error"]:
+            return f"[Validator] Patch failed to apply: {report['apply_error']}"
 
-            if errors:
-                return "[Validator] Syntax errors found:\n" + "\n".join([f"{f}: {msg.strip()}" for f, msg in errors])
-            return "[Validator] Patch validated successfully."
+        errors = [r for r in report["files"] if not r["ok"]]
+        if errors:
+            return "[Validator] Syntax errors found:\n" + "\n".join([f"{r['file']}:{r['line']}: {r['error']}" for r in errors])
+        if report["tests"] and not report["tests"]["ok"]:
+            return "[Validator] Affected tests failed:\n" + report["tests"]["output"]
+        return "[Validator] Patch validated successfully."
@@ -0,0 +1,142 @@
+import json
+import os
+import sys
+import threading
+import time
+import timeit
+from collections import Counter, deque
+from datetime import datetime
+
+MIN_INTERVAL = 0.001
+
+def check_interval(interval: float) -> float:
+    """Rejects non-positive sampling intervals and clamps tiny ones to MIN_INTERVAL."""
+    if interval is None or interval <= 0:
+        raise ValueError(f"Sampling interval must be positive, got {interval}")
+    return max(float(interval), MIN_INTERVAL)
+
+class SamplingProfiler:
+    """Low-overhead stack sampler; aggregates per-function time over a sliding window."""
+
+    def __init__(self, interval: float = 0.01, window: int = 300, report_path: str = "./data/hot_paths.json",
+                 base_dir: str = None):
+        self.interval = check_interval(interval)
+        self.window = window
+        self.report_path = report_path
+        self.base_dir = os.path.abspath(base_dir or os.getcwd())
+        self.buckets = deque()
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float = None):
+        if interval is not None:
+            interval = check_interval(interval)
+        if self.running:
+            return False
+        if interval is not None:
+            self.interval = interval
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, name="lp1-profiler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        if not self.running:
+            return False
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        return True
+
+    def _bucket(self, now: float):
+        second = int(now)
+        if not self.buckets or self.buckets[-1][0] != second:
+            self.buckets.append((second, Counter(), Counter()))
+        while self.buckets and self.buckets[0][0] <= second - self.window:
+            self.buckets.popleft()
+        return self.buckets[-1]
+
+    def _sample_loop(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self.lock:
+                _, self_counts, cumulative = self._bucket(time.time())
+                for thread_id, frame in frames.items():
+                    if thread_id == own_id:
+                        continue
+                    seen = set()
+                    leaf = True
+                    while frame is not None:
+                        code = frame.f_code
+                        key = (code.co_filename, getattr(code, "co_qualname", code.co_name), code.co_firstlineno)
+                        if leaf:
+                            self_counts[key] += 1
+                            leaf = False
+                        if key not in seen:
+                            cumulative[key] += 1
+                            seen.add(key)
+                        frame = frame.f_back
+
+    def report(self, limit: int = 20, window: int = None, project_only: bool = True):
+        window = window or self.window
+        cutoff = int(time.time()) - window
+        self_total, cumulative_total = Counter(), Counter()
+        with self.lock:
+            for second, self_counts, cumulative in self.buckets:
+                if second > cutoff:
+                    self_total.update(self_counts)
+                    cumulative_total.update(cumulative)
+
+        prefix = self.base_dir + os.sep
+        ranked = []
+        for (filename, function, line), samples in cumulative_total.most_common():
+            path = os.path.abspath(filename)
+            if project_only and (not path.startswith(prefix) or "site-packages" in path):
+                continue
+            ranked.append({
+                "file": path,
+                "function": function,
+                "line": line,
+                "cumulative_seconds": round(samples * self.interval, 4),
+                "self_seconds": round(self_total[(filename, function, line)] * self.interval, 4),
+                "samples": samples
+            })
+            if len(ranked) >= limit:
+                break
+        return ranked
+
+    def save_report(self, limit: int = 50):
+        report = {"generated": datetime.utcnow().isoformat(), "window": self.window, "functions": self.report(limit)}
+        os.makedirs(os.path.dirname(os.path.abspath(self.report_path)), exist_ok=True)
+        tmp_path = self.report_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, self.report_path)
+        return report
+
+def load_report(path: str = "./data/hot_paths.json"):
+    if not os.path.exists(path):
+        return {"functions": []}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def ab_compare(baseline, candidate, args=(), kwargs=None, repeat: int = 5, number: int = None):
+    """Times two implementations on the same input; compares best-of-repeat per-call time."""
+    kwargs = kwargs or {}
+    same_result = baseline(*args, **kwargs) == candidate(*args, **kwargs)
+    if number is None:
+        number, _ = timeit.Timer(lambda: baseline(*args, **kwargs)).autorange()
+    baseline_s = min(timeit.repeat(lambda: baseline(*args, **kwargs), repeat=repeat, number=number)) / number
+    candidate_s = min(timeit.repeat(lambda: candidate(*args, **kwargs), repeat=repeat, number=number)) / number
+    return {
+        "baseline_s": baseline_s,
+        "candidate_s": candidate_s,
+        "speedup": baseline_s / candidate_s if candidate_s else float("inf"),
+        "same_result": same_result
+    }
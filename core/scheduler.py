@@ -1,33 +1,211 @@
 
 import asyncio
+import heapq
+import itertools
+import random
+import time
 from datetime import datetime, timedelta
 
+CRON_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+MISSED_POLICIES = {"run_once", "skip", "catch_up"}
+
+class CronSchedule:
+    """5-field cron expression: minute hour day-of-month month day-of-week (0 or 7 = Sunday).
+
+    As in standard cron, when both day fields are restricted a day matches if either does.
+    """
+
+    def __init__(self, expr: str):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expr}'")
+        self.expr = expr
+        self.minutes, self.hours, self.days, self.months, self.weekdays = [
+            self._parse(field, low, high) for field, (low, high) in zip(fields, CRON_RANGES)
+        ]
+        self.weekdays = {day % 7 for day in self.weekdays}
+        self.days_restricted = not fields[2].startswith("*")
+        self.weekdays_restricted = not fields[4].startswith("*")
+
+    @staticmethod
+    def _parse(field: str, low: int, high: int):
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/")
+                step = int(step)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = [int(v) for v in part.split("-")]
+            else:
+                start = end = int(part)
+            if start < low or end > high:
+                raise ValueError(f"Cron value out of range {low}-{high}: '{field}'")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 4)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self.day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression never fires: '{self.expr}'")
+
+class ScheduledTask:
+    def __init__(self, name, func, interval=None, cron=None, timeout=None, max_concurrency=1,
+                 jitter=0.0, missed="run_once", misfire_grace=60.0, max_catch_up=10):
+        if (interval is None) == (cron is None):
+            raise ValueError(f"Task '{name}' needs exactly one of interval or cron.")
+        if missed not in MISSED_POLICIES:
+            raise ValueError(f"Unknown missed-run policy '{missed}' for task '{name}'.")
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.cron = CronSchedule(cron) if cron else None
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self.missed = missed
+        self.misfire_grace = misfire_grace
+        self.max_catch_up = max_catch_up
+        self.running = set()
+        self.due = None
+
+    def next_due(self, after: float) -> float:
+        if self.interval is not None:
+            return after + self.interval
+        return self.cron.next_after(datetime.fromtimestamp(after)).timestamp()
+
 class Scheduler:
-    def __init__(self, config, skills):
+    def __init__(self, config, skills, startup_delay=5):
         self.skills = skills
-        self.tasks = [
-            ("self_check", self.run_health_check, 3600),
-        ]
+        self.startup_delay = startup_delay
+        self.tasks = {}
         self.last_run = {}
+        self._heap = []
+        self._seq = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._running = set()
+        self.add_task("self_check", self.run_health_check, interval=3600, timeout=60)
 
     async def run_health_check(self):
         result = await self.skills.route("system status")
         print(f"[Scheduled Health Check @ {datetime.utcnow().isoformat()}] {result}")
 
+    def add_task(self, name, func, interval=None, cron=None, **options):
+        task = ScheduledTask(name, func, interval=interval, cron=cron, **options)
+        now = time.time()
+        task.due = now if interval is not None else task.next_due(now)
+        self.tasks[name] = task
+        self._push(task)
+        return task
+
+    def remove_task(self, name):
+        self.tasks.pop(name, None)
+        self._wakeup.set()
+
+    def _push(self, task):
+        heapq.heappush(self._heap, (task.due + random.uniform(0, task.jitter), next(self._seq), task))
+        self._wakeup.set()
+
+    async def _sleep(self, delay, stop_event):
+        self._wakeup.clear()
+        waiters = [asyncio.ensure_future(self._wakeup.wait()), asyncio.ensure_future(stop_event.wait())]
+        try:
+            await asyncio.wait(waiters, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _execute(self, task):
+        try:
+            if task.timeout:
+                await asyncio.wait_for(task.func(), timeout=task.timeout)
+            else:
+                await task.func()
+            self.last_run[task.name] = datetime.utcnow()
+        except asyncio.TimeoutError:
+            print(f"[Scheduler] Task {task.name} timed out after {task.timeout}s")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Scheduler] Failed task {task.name}: {e}")
+
+    def _start(self, task):
+        if len(task.running) >= task.max_concurrency:
+            print(f"[Scheduler] Skipping {task.name}: {len(task.running)} run(s) still in progress")
+            return
+        job = asyncio.create_task(self._execute(task))
+        task.running.add(job)
+        self._running.add(job)
+        job.add_done_callback(task.running.discard)
+        job.add_done_callback(self._running.discard)
+
+    def _dispatch(self, task, now):
+        late = now - task.due
+        if late <= task.misfire_grace:
+            self._start(task)
+            task.due = task.next_due(task.due)
+            if task.due <= now:
+                task.due = task.next_due(now)
+        elif task.missed == "run_once":
+            self._start(task)
+            task.due = task.next_due(now)
+        elif task.missed == "skip":
+            print(f"[Scheduler] Skipping missed run of {task.name} ({late:.0f}s late)")
+            task.due = task.next_due(now)
+        else:
+            runs = 0
+            while task.due <= now and runs < task.max_catch_up:
+                self._start(task)
+                task.due = task.next_due(task.due)
+                runs += 1
+            if task.due <= now:
+                task.due = task.next_due(now)
+        self._push(task)
+
     async def run_background_tasks(self, stop_event):
-        await asyncio.sleep(5)  # Delay scheduler startup
-        while not stop_event.is_set():
-            now = datetime.utcnow()
-            for name, coro, interval in self.tasks:
-                last = self.last_run.get(name, datetime.min)
-                if (now - last).total_seconds() >= interval:
-                    try:
-                        await coro()
-                        self.last_run[name] = now
-                    except Exception as e:
-                        print(f"[Scheduler] Failed task {name}: {e}")
-            await asyncio.sleep(10)
+        await asyncio.sleep(self.startup_delay)  # Delay scheduler startup
+        try:
+            while not stop_event.is_set():
+                if not self._heap:
+                    await self._sleep(None, stop_event)
+                    continue
+                when, _, task = self._heap[0]
+                if self.tasks.get(task.name) is not task:
+                    heapq.heappop(self._heap)
+                    continue
+                delay = when - time.time()
+                if delay > 0:
+                    await self._sleep(delay, stop_event)
+                    continue
+                heapq.heappop(self._heap)
+                self._dispatch(task, time.time())
+        finally:
+            await self.shutdown()
 
     async def shutdown(self):
-        # Cancel any running background tasks here
-        pass
+        jobs = list(self._running)
+        for job in jobs:
+            job.cancel()
+        if jobs:
+            await asyncio.gather(*jobs, return_exceptions=True)
+        self._running.clear()
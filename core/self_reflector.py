@@ -1,32 +1,38 @@
-import ast
 import os
+from core.code_index import CodeIndex
 
 class FunctionReflector:
-    def __init__(self, base_dir):
+    def __init__(self, base_dir, index=None):
         self.base_dir = base_dir
+        self.index = index or CodeIndex(base_dir)
 
     def extract_functions(self):
         summaries = []
         print("[FunctionReflector] Starting scan in:", self.base_dir)
-        for root, _, files in os.walk(self.base_dir):
-            for file in files:
-                if file.endswith(".py") and not file.startswith("_"):
-                    path = os.path.join(root, file)
-                    print(f"[FunctionReflector] Parsing: {path}")
-                    try:
-                        with open(path, "r", encoding="utf-8") as f:
-                            tree = ast.parse(f.read(), filename=path)
-                        for node in ast.walk(tree):
-                            if isinstance(node, ast.FunctionDef):
-                                doc = ast.get_docstring(node) or ""
-                                summaries.append({
-                                    "file": path,
-                                    "function": node.name,
-                                    "args": [arg.arg for arg in node.args.args],
-                                    "doc": doc[:100].replace("\n", " ")
-                                })
-                    except Exception as e:
-                        print(f"[FunctionReflector] Failed: {path} — {e}")
-                        summaries.append({ "file": path, "error": str(e) })
+        stats = self.index.refresh()
+        print(f"[FunctionReflector] Index refreshed: {stats['parsed']} parsed, {stats['unchanged']} unchanged")
+        for path, entry in sorted(self.index.entries().items()):
+            if os.path.basename(path).startswith("_"):
+                continue
+            if entry.get("error"):
+                print(f"[FunctionReflector] Failed: {path} — {entry['error']}")
+                summaries.append({ "file": path, "error": entry["error"] })
+                continue
+            for fn in entry.get("functions", []):
+                summaries.append({"file": path, **fn})
         print(f"[FunctionReflector] Total functions: {len(summaries)}")
         return summaries
+
+    def hot_functions(self, report, limit=10):
+        # Profiler report entries mapped onto indexed functions, hottest first.
+        self.index.refresh()
+        targets = []
+        for hot in report.get("functions", []):
+            fn = self.index.find(hot["file"], hot["function"])
+            if fn is None:
+                continue
+            targets.append({"file": hot["file"], **fn,
+                            "cumulative_seconds": hot["cumulative_seconds"], "self_seconds": hot["self_seconds"]})
+            if len(targets) >= limit:
+                break
+        return targets
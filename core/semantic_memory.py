@@ -1,35 +1,133 @@
 import os
 import json
+import threading
 import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
+from core.dedup import content_hash
+from core.metrics import metrics
+from core.text_index import BM25Index, keyword_confident, reciprocal_rank_fusion
 
 class SemanticMemory:
     def __init__(self, config):
         self.index_path = config["vector_store"]
         self.model = SentenceTransformer("all-MiniLM-L6-v2")
         self.data_path = self.index_path.replace(".faiss", ".json")
+        # Parallel to `texts`: the file each chunk was ingested from (None for direct stores).
+        self.sources_path = self.index_path.replace(".faiss", ".sources.json")
 
         self.texts = []
+        self.sources = []
         self.index = faiss.IndexFlatL2(384)
 
         if os.path.exists(self.index_path) and os.path.exists(self.data_path):
             self.index = faiss.read_index(self.index_path)
             with open(self.data_path, "r") as f:
                 self.texts = json.load(f)
+            if os.path.exists(self.sources_path):
+                with open(self.sources_path, "r") as f:
+                    self.sources = json.load(f)
+        self.sources = (self.sources + [None] * len(self.texts))[:len(self.texts)]
+
+        # Guards the FAISS index, texts and hashes; encodes run outside it.
+        self.lock = threading.RLock()
+        self._reindex()
+
+    def _reindex(self):
+        self.text_index = BM25Index()
+        self.hashes = set()
+        for i, text in enumerate(self.texts):
+            self.text_index.add(i, text)
+            self.hashes.add(content_hash(text))
 
     def save(self):
-        faiss.write_index(self.index, self.index_path)
-        with open(self.data_path, "w") as f:
-            json.dump(self.texts, f, indent=2)
+        with self.lock, metrics.timer("persist", component="semantic"):
+            faiss.write_index(self.index, self.index_path)
+            with open(self.data_path, "w") as f:
+                json.dump(self.texts, f, indent=2)
+            with open(self.sources_path, "w") as f:
+                json.dump(self.sources, f)
 
     def store(self, text: str):
-        vector = self.model.encode([text])
-        self.index.add(np.array(vector, dtype=np.float32))
-        self.texts.append(text)
-        self.save()
+        digest = content_hash(text)
+        with self.lock:
+            if digest in self.hashes:
+                metrics.inc("lp1_dedup_merged_total", help_text="Writes merged into an existing entry.", role="semantic", kind="exact")
+                return
+            self.hashes.add(digest)
+        with metrics.timer("encode", component="semantic"):
+            vector = self.model.encode([text])
+        with self.lock:
+            self.index.add(np.array(vector, dtype=np.float32))
+            self.text_index.add(len(self.texts), text)
+            self.texts.append(text)
+            self.sources.append(None)
+            self.save()
+
+    def store_many(self, texts, batch_size: int = 256, save: bool = True, sources=None):
+        sources = sources if sources is not None else [None] * len(texts)
+        unique, unique_sources = [], []
+        with self.lock:
+            for text, source in zip(texts, sources):
+                digest = content_hash(text)
+                if digest not in self.hashes:
+                    self.hashes.add(digest)
+                    unique.append(text)
+                    unique_sources.append(source)
+        if len(unique) < len(texts):
+            metrics.inc("lp1_dedup_merged_total", len(texts) - len(unique), help_text="Writes merged into an existing entry.", role="semantic", kind="exact")
+        texts = unique
+        if not texts:
+            return 0
+        with metrics.timer("encode", component="semantic"):
+            vectors = self.model.encode(texts, batch_size=batch_size)
+        with self.lock:
+            self.index.add(np.array(vectors, dtype=np.float32))
+            for i, text in enumerate(texts, start=len(self.texts)):
+                self.text_index.add(i, text)
+            self.texts.extend(texts)
+            self.sources.extend(unique_sources)
+            if save:
+                self.save()
+        return len(texts)
+
+    def remove_source(self, source: str, save: bool = True):
+        return self.remove_sources([source], save=save)
+
+    def remove_sources(self, sources, save: bool = True):
+        """Drops every chunk ingested from `sources` in one pass; later positions shift down like the FAISS ids."""
+        sources = set(sources)
+        with self.lock:
+            positions = [i for i, s in enumerate(self.sources) if s is not None and s in sources]
+            if not positions:
+                return 0
+            self.index.remove_ids(np.array(positions, dtype=np.int64))
+            removed = set(positions)
+            self.texts = [t for i, t in enumerate(self.texts) if i not in removed]
+            self.sources = [s for i, s in enumerate(self.sources) if i not in removed]
+            self._reindex()
+            if save:
+                self.save()
+        return len(positions)
 
     def query(self, prompt: str, top_k: int = 5):
-        vector = self.model.encode([prompt])
-        distances, indices = self.index.search(np.array(vector, dtype=np.float32), top_k)
-        return [self.texts[i] for i in indices[0] if i < len(self.texts)]
\ No newline at end of file
+        with metrics.timer("encode", component="semantic"):
+            vector = self.model.encode([prompt])
+        with self.lock, metrics.timer("recall", component="semantic"):
+            distances, indices = self.index.search(np.array(vector, dtype=np.float32), top_k)
+        return [self.texts[i] for i in indices[0] if i < len(self.texts)]
+
+    def hybrid_query(self, prompt: str, top_k: int = 5):
+        with self.lock, metrics.timer("keyword_search", component="semantic"):
+            keyword = self.text_index.search(prompt, limit=top_k * 4)
+        if keyword_confident(keyword):
+            metrics.inc("lp1_keyword_fast_path_total", help_text="Hybrid queries answered by BM25 alone.", component="semantic")
+            return [self.texts[i] for i, _ in keyword[:top_k]]
+
+        with metrics.timer("encode", component="semantic"):
+            vector = self.model.encode([prompt])
+        with self.lock, metrics.timer("recall", component="semantic"):
+            distances, indices = self.index.search(np.array(vector, dtype=np.float32), top_k * 4)
+        vector_ranked = [int(i) for i in indices[0] if 0 <= i < len(self.texts)]
+        fused = reciprocal_rank_fusion([[i for i, _ in keyword], vector_ranked])
+        return [self.texts[i] for i, _ in fused[:top_k]]
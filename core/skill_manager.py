@@ -4,14 +4,17 @@ import importlib
 import inspect
 import traceback
 from typing import Dict, Callable, Any
+from core.metrics import metrics
 
 class SkillManager:
-    def __init__(self, config, gpt, memory, semantic, goal_engine=None):
+    def __init__(self, config, gpt, memory, semantic, goal_engine=None, feedback=None):
         self.skills: Dict[str, Callable] = {}
         self.config = config
+        self.gpt = gpt
         self.memory = memory
         self.semantic = semantic
         self.goal_engine = goal_engine
+        self.feedback = feedback
         self.load_skills()
 
     def load_skills(self):
@@ -21,38 +24,77 @@ class SkillManager:
                 module_name = f"skills.{filename[:-3]}"
                 try:
                     module = importlib.import_module(module_name)
-                    for _, obj in inspect.getmembers(module, inspect.isclass):
-                        if hasattr(obj, "describe") and hasattr(obj, "handle"):
-                            init_args = inspect.signature(obj.__init__).parameters
-                            kwargs = {}
-                            if "memory" in init_args:
-                                kwargs["memory"] = self.memory
-                            if "goal_engine" in init_args:
-                                kwargs["goal_engine"] = self.goal_engine
-                            instance = obj(**kwargs)
-                            skill_name = instance.describe().get("name", filename[:-3])
-                            self.skills[skill_name] = instance
+                    self.skills.update(self.instantiate_module(module, default_name=filename[:-3]))
                 except Exception as e:
                     print(f"[SkillManager] Failed to load {module_name}: {e}")
                     traceback.print_exc()
 
-    def can_handle(self, user_input: str) -> bool:
-        lowered = user_input.lower()
+    def _instantiate(self, cls):
+        init_args = inspect.signature(cls.__init__).parameters
+        kwargs = {}
+        if "gpt" in init_args:
+            kwargs["gpt"] = self.gpt
+        if "memory" in init_args:
+            kwargs["memory"] = self.memory
+        if "goal_engine" in init_args:
+            kwargs["goal_engine"] = self.goal_engine
+        if "feedback" in init_args:
+            kwargs["feedback"] = self.feedback
+        return cls(**kwargs)
+
+    def instantiate_module(self, module, default_name=None):
+        instances = {}
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if hasattr(obj, "describe") and hasattr(obj, "handle"):
+                instance = self._instantiate(obj)
+                skill_name = instance.describe().get("name", default_name or module.__name__.rsplit(".", 1)[-1])
+                instances[skill_name] = instance
+        return instances
+
+    def reload_module(self, module):
+        # Fresh instances from the reloaded classes, carrying over the old instances' state.
+        instances = self.instantiate_module(module)
+        for name, instance in instances.items():
+            old = self.skills.get(name)
+            if old is not None:
+                instance.__dict__.update(old.__dict__)
+            if not inspect.iscoroutinefunction(instance.handle):
+                raise TypeError(f"Skill '{name}' handle() must be async.")
+        self.skills.update(instances)
+        return list(instances)
+
+    def set_last_response(self, user_input: str, response: str, response_id: str):
+        # Lets conversational skills (e.g. feedback) refer back to the previous answer.
         for skill in self.skills.values():
-            triggers = skill.describe().get("trigger", [])
-            if any(trigger in lowered for trigger in triggers):
-                return True
-        return False
+            if hasattr(skill, "set_context"):
+                skill.set_context(user_input, response, response_id=response_id)
 
-    async def handle(self, user_input: str, context: Any = None) -> str:
+    def match(self, user_input: str):
         lowered = user_input.lower()
-        for skill in self.skills.values():
+        for name, skill in self.skills.items():
             triggers = skill.describe().get("trigger", [])
             if any(trigger in lowered for trigger in triggers):
-                return await skill.handle(user_input, context=context)
+                return name
+        return None
+
+    def can_handle(self, user_input: str) -> bool:
+        return self.match(user_input) is not None
+
+    async def handle(self, user_input: str, context: Any = None) -> str:
+        with metrics.timer("skill_routing"):
+            name = self.match(user_input)
+        if name is not None:
+            return await self.execute(name, user_input, context)
         return "[LP1] No applicable skill found."
 
+    async def execute(self, name: str, user_input: str, context: Any = None) -> str:
+        metrics.inc("lp1_skill_calls_total", help_text="Skill invocations.", skill=name)
+        with metrics.timer("skill_execution", skill=name):
+            return await self.skills[name].handle(user_input, context=context)
+
     async def route(self, user_input: str, context: Any = None) -> str:
-        if self.can_handle(user_input):
-            return await self.handle(user_input, context=context)
+        with metrics.timer("skill_routing"):
+            name = self.match(user_input)
+        if name is not None:
+            return await self.execute(name, user_input, context)
         return "[SkillManager] No matching skill found."
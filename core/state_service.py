@@ -0,0 +1,164 @@
+import asyncio
+import functools
+import json
+import os
+import signal
+import socket
+import threading
+
+# Methods that HTTP workers may call on the shared objects.
+EXPOSED_METHODS = {
+    "memory": {"log", "recall", "recall_many", "hybrid_recall", "hybrid_search", "get", "active_goal_id",
+               "dedup_stats", "save", "flush"},
+    "semantic": {"store", "store_many", "query", "hybrid_query", "save"},
+    "goals": {"add_goal", "update_goal", "get_active_goals", "get_goals_by_status", "get_goal_by_id", "save"},
+    "feedback": {"register", "record", "summary", "daily"},
+    "metrics": {"push", "render"},
+}
+
+def _json_default(value):
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class StateServer:
+    """Owns memory, vector search, goals and feedback for all HTTP workers behind a Unix socket."""
+
+    def __init__(self, config, socket_path: str = None, targets: dict = None):
+        self.socket_path = socket_path or config["state_socket"]
+        self.targets = targets if targets is not None else self._build_targets(config)
+
+    def _build_targets(self, config):
+        from core.memory_manager import MemoryManager
+        from core.semantic_memory import SemanticMemory
+        from core.goal_engine import GoalEngine
+        from core.feedback_engine import FeedbackEngine
+        from core.metrics import MetricsAggregator, metrics
+
+        memory = MemoryManager(config)
+        return {
+            "memory": memory,
+            "semantic": SemanticMemory(config),
+            "goals": GoalEngine(config, memory=memory, gpt=None),
+            "feedback": FeedbackEngine(config),
+            "metrics": MetricsAggregator(metrics)
+        }
+
+    async def _call(self, request: dict):
+        target_name = request.get("target")
+        method_name = request.get("method")
+        if method_name not in EXPOSED_METHODS.get(target_name, ()):
+            raise ValueError(f"Unknown method: {target_name}.{method_name}")
+        method = getattr(self.targets[target_name], method_name)
+        # Each target locks only around its own index and file updates (encodes run
+        # outside those locks), so calls from different workers proceed in parallel.
+        return await asyncio.to_thread(method, *request.get("args", []), **request.get("kwargs", {}))
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    reply = {"result": await self._call(json.loads(line))}
+                except Exception as e:
+                    reply = {"error": f"{type(e).__name__}: {e}"}
+                writer.write(json.dumps(reply, default=_json_default).encode("utf-8") + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def close(self):
+        """Writes every target's pending state to disk and removes the socket file."""
+        for name, target in self.targets.items():
+            persist = getattr(target, "flush", None) or getattr(target, "save", None)
+            if persist is None:
+                continue
+            try:
+                persist()
+            except Exception as e:
+                print(f"[StateServer] Failed to save {name}: {e}")
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+    async def serve(self):
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=64 * 1024 * 1024)
+        print(f"[StateServer] Listening on {self.socket_path}")
+        stop = asyncio.Event()
+        if threading.current_thread() is threading.main_thread():
+            loop = asyncio.get_running_loop()
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                loop.add_signal_handler(sig, stop.set)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            # Workers log with persist=False, so unsaved entries only reach disk here.
+            await asyncio.to_thread(self.close)
+            print("[StateServer] Stopped")
+
+class StateClient:
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.socket_path)
+            conn = sock.makefile("rwb")
+            self._local.conn = conn
+        return conn
+
+    def _reset(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+        self._local.conn = None
+
+    def call(self, target: str, method: str, *args, **kwargs):
+        """Blocking round trip; call it from async code via asyncio.to_thread."""
+        request = {"target": target, "method": method, "args": args, "kwargs": kwargs}
+        payload = json.dumps(request, default=_json_default).encode("utf-8") + b"\n"
+        for attempt in range(2):
+            try:
+                conn = self._connection()
+                conn.write(payload)
+                conn.flush()
+                line = conn.readline()
+                if not line:
+                    raise ConnectionError("State service closed the connection.")
+                break
+            except OSError:
+                self._reset()
+                if attempt:
+                    raise
+        reply = json.loads(line)
+        if "error" in reply:
+            raise RuntimeError(f"[StateClient] {target}.{method} failed: {reply['error']}")
+        return reply["result"]
+
+    def proxy(self, target: str):
+        return RemoteProxy(self, target)
+
+class RemoteProxy:
+    def __init__(self, client: StateClient, target: str):
+        self._client = client
+        self._target = target
+
+    def __getattr__(self, name):
+        if name not in EXPOSED_METHODS.get(self._target, ()):
+            raise AttributeError(f"'{self._target}' has no remote method '{name}'")
+        return functools.partial(self._client.call, self._target, name)
+
+if __name__ == "__main__":
+    from core.config import load_config
+
+    config = load_config()
+    if not config["state_socket"]:
+        config["state_socket"] = "./data/lp1_state.sock"
+    asyncio.run(StateServer(config).serve())
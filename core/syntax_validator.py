@@ -0,0 +1,102 @@
+import ast
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+PARALLEL_THRESHOLD = 16
+
+def files_touched_by_patch(patch_text: str, include_sources: bool = False):
+    """Returns the paths a unified diff creates or modifies (plus the pre-image paths if include_sources)."""
+    prefixes = ("+++ ", "--- ") if include_sources else ("+++ ",)
+    touched = []
+    for line in patch_text.splitlines():
+        if not line.startswith(prefixes):
+            continue
+        path = line[4:].split("\t")[0].strip()
+        if path == "/dev/null":
+            continue
+        if path.startswith(("a/", "b/")):
+            path = path[2:]
+        if path not in touched:
+            touched.append(path)
+    return touched
+
+def check_source(source: str, filename: str = "<patch>") -> dict:
+    try:
+        compile(source, filename, "exec", dont_inherit=True)
+        return {"file": filename, "ok": True, "error": None, "line": None}
+    except SyntaxError as e:
+        return {"file": filename, "ok": False, "error": f"{type(e).__name__}: {e.msg}", "line": e.lineno}
+    except ValueError as e:
+        return {"file": filename, "ok": False, "error": str(e), "line": None}
+
+def check_file(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return check_source(f.read(), path)
+    except (OSError, UnicodeDecodeError) as e:
+        return {"file": path, "ok": False, "error": str(e), "line": None}
+
+def validate_files(paths, workers: int = None):
+    paths = [p for p in paths if p.endswith(".py")]
+    if len(paths) < PARALLEL_THRESHOLD:
+        return [check_file(p) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(check_file, paths, chunksize=8))
+
+def _module_name(rel_path: str) -> str:
+    module = rel_path[:-3].replace("/", ".").replace(os.sep, ".")
+    return module[:-len(".__init__")] if module.endswith(".__init__") else module
+
+def affected_tests(rel_paths, root: str, tests_dir: str = "tests"):
+    """Finds test files that import any of the modules in rel_paths (or are themselves touched)."""
+    modules = {_module_name(p) for p in rel_paths if p.endswith(".py")}
+    tests_root = os.path.join(root, tests_dir)
+    selected = [p for p in rel_paths if p.startswith(tests_dir + "/") and os.path.basename(p).startswith("test_")]
+    if not modules or not os.path.isdir(tests_root):
+        return selected
+
+    for name in sorted(os.listdir(tests_root)):
+        rel_test = f"{tests_dir}/{name}"
+        if not (name.startswith("test_") and name.endswith(".py")) or rel_test in selected:
+            continue
+        try:
+            with open(os.path.join(tests_root, name), "r", encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError):
+            continue
+        imported = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                imported.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                imported.add(node.module)
+                imported.update(f"{node.module}.{alias.name}" for alias in node.names)
+        if imported & modules:
+            selected.append(rel_test)
+    return selected
+
+def run_affected_tests(test_files, root: str, timeout: int = 300) -> dict:
+    if not test_files:
+        return {"ok": True, "tests": [], "output": "No affected tests."}
+    try:
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "-q", *test_files],
+            cwd=root, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=timeout
+        )
+        return {"ok": result.returncode == 0, "tests": list(test_files),
+                "output": result.stdout.decode("utf-8", errors="replace")[-4000:]}
+    except subprocess.TimeoutExpired:
+        return {"ok": False, "tests": list(test_files), "output": f"Tests timed out after {timeout}s."}
+
+def validate_workspace(root: str, patch_text: str, run_tests: bool = False, workers: int = None) -> dict:
+    touched = files_touched_by_patch(patch_text)
+    files = validate_files([os.path.join(root, p) for p in touched], workers=workers)
+    for result in files:
+        result["file"] = os.path.relpath(result["file"], root)
+    report = {"ok": all(r["ok"] for r in files), "touched": touched, "files": files, "tests": None}
+    if run_tests and report["ok"]:
+        report["tests"] = run_affected_tests(affected_tests(touched, root), root)
+        report["ok"] = report["tests"]["ok"]
+    return report
@@ -0,0 +1,87 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+TOKEN_RE = re.compile(r"[a-z0-9_]+(?:[./\-:][a-z0-9_]+)*")
+PART_RE = re.compile(r"[./\-:]+")
+
+def tokenize(text: str):
+    """Lowercased word tokens; identifiers like `core/memory_manager.py` also yield their parts."""
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        parts = [p for p in PART_RE.split(token) if p]
+        words = [w for part in parts for w in part.split("_") if w]
+        tokens.append(token)
+        tokens.extend(p for p in parts if p != token)
+        tokens.extend(w for w in words if w not in parts)
+    return tokens
+
+class BM25Index:
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_terms
+
+    def add(self, doc_id, text: str):
+        if doc_id in self.doc_terms:
+            self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = sum(terms.values())
+        self.total_length += self.doc_lengths[doc_id]
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self.total_length -= self.doc_lengths.pop(doc_id)
+        for term in terms:
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(doc_id, None)
+                if not docs:
+                    del self.postings[term]
+
+    def search(self, query: str, limit: int = 10, accept=None):
+        n_docs = len(self.doc_terms)
+        if not n_docs:
+            return []
+        avg_length = self.total_length / n_docs or 1.0
+        scores = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                length = self.doc_lengths[doc_id]
+                norm = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / avg_length))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+        if accept is not None:
+            scores = {doc_id: score for doc_id, score in scores.items() if accept(doc_id)}
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+
+def reciprocal_rank_fusion(rankings, k: int = 60):
+    fused = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
+
+def keyword_confident(results, min_score: float = 2.0, margin: float = 1.5) -> bool:
+    """True when the best BM25 hit is strong and clearly ahead of the runner-up."""
+    if not results or results[0][1] < min_score:
+        return False
+    return len(results) == 1 or results[0][1] >= margin * results[1][1]
@@ -0,0 +1,51 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+
+# Never copied into a validation workspace: model weights, runtime data, envs and caches.
+IGNORED_DIRS = {".git", "data", "models", "venv", ".venv", "env", "__pycache__", "node_modules",
+                ".tox", ".nox", ".pytest_cache", ".mypy_cache", ".ruff_cache"}
+
+def _is_ignored(rel_path: str) -> bool:
+    return any(part in IGNORED_DIRS for part in rel_path.split(os.sep)[:-1])
+
+def _in_virtualenv(rel_path: str, env_dirs) -> bool:
+    return any(rel_path.startswith(env_dir + os.sep) for env_dir in env_dirs)
+
+def source_files(base_dir: str):
+    """Lists tracked (and new, non-ignored) files under base_dir, skipping data, model and virtualenv dirs."""
+    try:
+        result = subprocess.run(
+            ["git", "-C", base_dir, "ls-files", "-z", "--cached", "--others", "--exclude-standard"],
+            check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+        )
+        paths = [os.path.normpath(p) for p in result.stdout.decode("utf-8").split("\0") if p]
+    except (OSError, subprocess.CalledProcessError):
+        paths = []
+        for root, dirs, files in os.walk(base_dir):
+            dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+            paths.extend(os.path.relpath(os.path.join(root, name), base_dir) for name in files)
+    # --others lists untracked virtualenvs under any name; pyvenv.cfg marks their root.
+    env_dirs = [os.path.dirname(p) for p in paths if os.path.basename(p) == "pyvenv.cfg" and os.path.dirname(p)]
+    return [p for p in paths if not _is_ignored(p) and not _in_virtualenv(p, env_dirs)
+            and os.path.isfile(os.path.join(base_dir, p))]
+
+def check_patch(base_dir: str, patch_path: str):
+    """Runs `git apply --check`; returns (ok, error message) without touching any files."""
+    result = subprocess.run(
+        ["git", "-C", base_dir, "apply", "--check", os.path.abspath(patch_path)],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE
+    )
+    return result.returncode == 0, result.stderr.decode("utf-8", errors="replace").strip()
+
+@contextmanager
+def isolated_workspace(base_dir: str, files=None):
+    """Yields a temporary copy of base_dir that only contains source files."""
+    with tempfile.TemporaryDirectory(prefix="lp1_ws_") as tmp:
+        for rel_path in files if files is not None else source_files(base_dir):
+            target = os.path.join(tmp, rel_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(os.path.join(base_dir, rel_path), target)
+        yield tmp
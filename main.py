@@ -1,31 +1,95 @@
-
+import asyncio
+import os
 from core.context_builder import build_context
-from core.local_inference import LP1LocalModel
-from core.goal_engine import get_active_goal
-from core.memory_manager import store_memory
-from core.skill_manager import apply_skill_output
-
-def main():
-    model_path = "models/mistral.gguf"  # change dynamically as needed
-    lp1 = LP1LocalModel(model_path)
 
-    print("LP1 Ready. Type your message or 'exit' to quit.")
+async def post_turn_worker(queue):
+    # Runs memory logging and skill side effects in submission order.
     while True:
-        user_input = input("You: ")
-        if user_input.lower() in ("exit", "quit"):
-            break
+        job = await queue.get()
+        try:
+            await job()
+        except Exception as e:
+            print(f"[LP1] Background task failed: {e}")
+        finally:
+            queue.task_done()
+
+async def prepare_context(queue, memory, goals, skills):
+    # Wait for the previous turn's writes so the context reflects them.
+    await queue.join()
+    return await asyncio.to_thread(build_context, memory, goals, skills)
+
+async def read_input():
+    try:
+        return await asyncio.to_thread(input, "You: ")
+    except EOFError:
+        return "exit"
+
+async def run(lp1, memory, goals, skills, read=read_input, write=print, swapper=None):
+    queue = asyncio.Queue()
+    worker = asyncio.create_task(post_turn_worker(queue))
+    next_context = asyncio.create_task(prepare_context(queue, memory, goals, skills))
+
+    async def store_turn(user_input, response):
+        # Both entries go to disk in a single flush, off the prompt path.
+        await asyncio.to_thread(memory.log, "user", user_input, persist=False)
+        await asyncio.to_thread(memory.log, "assistant", response, persist=False)
+        await asyncio.to_thread(memory.flush)
 
-        # Generate context
-        context = build_context()
-        # Feed into local model
-        response = lp1.run_inference(user_input)
+    async def apply_skill(user_input):
+        if skills.match(user_input) is not None:
+            write(f"LP1 [skill]: {await skills.route(user_input)}")
+
+    write("LP1 Ready. Type your message or 'exit' to quit.")
+    try:
+        while True:
+            user_input = (await read()).strip()
+            if user_input.lower() in ("exit", "quit"):
+                break
+            if swapper is not None and user_input.startswith("/reload "):
+                write(f"LP1: {swapper.reload(user_input[len('/reload '):].strip())}")
+                continue
+
+            # Generate context (prepared while the user was typing)
+            context = await next_context
+            # Feed into local model
+            response = await asyncio.to_thread(lp1.run_inference, user_input, context)
+
+            # Output
+            write(f"LP1: {response}")
+
+            # Memory + Skill routing happen in the background
+            queue.put_nowait(lambda u=user_input, r=response: store_turn(u, r))
+            queue.put_nowait(lambda u=user_input: apply_skill(u))
+            next_context = asyncio.create_task(prepare_context(queue, memory, goals, skills))
+    finally:
+        # Flush pending writes in order before exiting.
+        await queue.join()
+        next_context.cancel()
+        worker.cancel()
+        await asyncio.gather(worker, next_context, return_exceptions=True)
+        await asyncio.to_thread(memory.flush)
+
+def main():
+    from core.config import load_config
+    from core.goal_engine import GoalEngine
+    from core.hot_reloader import HotReloader, same_interface
+    from core.live_swapper import LiveSwapper
+    from core.lp1_local_inference import LP1LocalModel
+    from core.memory_manager import MemoryManager
+    from core.semantic_memory import SemanticMemory
+    from core.skill_manager import SkillManager
 
-        # Output
-        print(f"LP1: {response}")
+    config = load_config()
+    memory = MemoryManager(config)
+    goals = GoalEngine(config, memory=memory, gpt=None)
+    skills = SkillManager(config, gpt=None, memory=memory, semantic=SemanticMemory(config), goal_engine=goals)
+    lp1 = LP1LocalModel()
 
-        # Memory + Skill routing
-        store_memory(user_input, response)
-        apply_skill_output(user_input, response, get_active_goal())
+    reloader = HotReloader(skills=skills)
+    for obj in (lp1, memory, goals, skills):
+        reloader.register(obj, smoke=same_interface(obj))
+    swapper = LiveSwapper(log_dir=os.path.join(config["data_path"], "rewrites"), reloader=reloader)
+    asyncio.run(run(lp1, memory, goals, skills, swapper=swapper))
 
 if __name__ == "__main__":
     main()
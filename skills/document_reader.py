@@ -3,6 +3,29 @@ from PyPDF2 import PdfReader
 from docx import Document
 from openpyxl import load_workbook
 
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".xlsx")
+
+def extract_text(path: str, max_rows: int = None) -> str:
+    """Returns the full text of a PDF, DOCX or XLSX file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".pdf":
+        return "\n".join([p.extract_text() or "" for p in PdfReader(path).pages])
+
+    elif extension == ".docx":
+        doc = Document(path)
+        return "\n".join([p.text for p in doc.paragraphs])
+
+    elif extension == ".xlsx":
+        wb = load_workbook(path, read_only=True)
+        rows = []
+        sheets = [wb.active] if max_rows else wb.worksheets
+        for sheet in sheets:
+            for row in sheet.iter_rows(min_row=1, max_row=max_rows, values_only=True):
+                rows.append("\t".join([str(value) for value in row]))
+        return "\n".join(rows)
+
+    raise ValueError(f"Unsupported file format: {path}")
+
 class DocumentReaderSkill:
     def describe(self):
         return {
@@ -17,20 +40,15 @@ class DocumentReaderSkill:
             if not os.path.exists(path):
                 return f"File not found: {path}"
 
-            if path.endswith(".pdf"):
-                text = "\n".join([p.extract_text() or "" for p in PdfReader(path).pages])
-                return text[:1500] or "[No extractable text found]"
+            extension = os.path.splitext(path)[1].lower()
+            if extension == ".pdf":
+                return extract_text(path)[:1500] or "[No extractable text found]"
 
-            elif path.endswith(".docx"):
-                doc = Document(path)
-                text = "\n".join([p.text for p in doc.paragraphs])
-                return text[:1500] or "[No readable content found]"
+            elif extension == ".docx":
+                return extract_text(path)[:1500] or "[No readable content found]"
 
-            elif path.endswith(".xlsx"):
-                wb = load_workbook(path)
-                sheet = wb.active
-                rows = ["\t".join([str(cell.value) for cell in row]) for row in sheet.iter_rows(min_row=1, max_row=20)]
-                return "\n".join(rows)
+            elif extension == ".xlsx":
+                return extract_text(path, max_rows=20)
 
             else:
                 return "Unsupported file format. Use PDF, DOCX, or XLSX."
@@ -1,14 +1,18 @@
+import asyncio
 from typing import Any
 
 class FeedbackHandler:
-    def __init__(self, memory=None):
-        self.memory = memory
+    def __init__(self, feedback=None):
+        self.feedback = feedback
         self.last_input = None
         self.last_response = None
+        self.last_response_id = None
 
-    def set_context(self, user_input: str, response: str):
+    def set_context(self, user_input: str, response: str, response_id: str = None):
+        # response_id is the FeedbackEngine id returned by register() for that response.
         self.last_input = user_input
         self.last_response = response
+        self.last_response_id = response_id
 
     def describe(self):
         return {
@@ -18,7 +22,7 @@ class FeedbackHandler:
         }
 
     async def handle(self, user_input: str, context: Any = None) -> str:
-        if not self.memory or not self.last_response:
+        if not self.feedback or not self.last_response_id:
             return "No response to provide feedback on."
 
         feedback_map = {
@@ -31,15 +35,13 @@ class FeedbackHandler:
         if not fb_value:
             return "Feedback not recognized."
 
-        # Find the most recent assistant memory entry that matches
-        for entry in reversed(self.memory.memory):
-            if entry.get("role") == "assistant" and entry.get("content") == self.last_response:
-                entry["feedback"] = fb_value
-                self.memory.save()
-                break
-        else:
-            return "Could not find the response to attach feedback."
+        response_id, self.last_response_id = self.last_response_id, None
+        if fb_value == "skipped":
+            return "Feedback skipped."
+        logged = await asyncio.to_thread(self.feedback.record, response_id, fb_value)
+        if logged is None:
+            return "That response was already rated."
 
         if fb_value == "negative":
             return "Noted. What would you like to correct or improve?"
-        return "Feedback saved."
\ No newline at end of file
+        return "Feedback saved."
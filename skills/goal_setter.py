@@ -1,5 +1,6 @@
 
 from typing import Any
+import asyncio
 import re
 
 class GoalSetter:
@@ -25,6 +26,6 @@ class GoalSetter:
             return "Please specify the goal clearly."
 
         description = match.group(2).strip().capitalize()
-        goal_id = self.goal_engine.add_goal(description)
+        goal_id = await asyncio.to_thread(self.goal_engine.add_goal, description)
 
         return f"Goal '{description}' has been set with ID {goal_id}."
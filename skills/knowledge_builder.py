@@ -1,9 +1,11 @@
 
 from typing import Any
+import asyncio
 import re
 
 class KnowledgeBuilder:
     def __init__(self, gpt=None, memory=None):
+        self.gpt = gpt
         self.memory = memory
 
     def describe(self):
@@ -13,8 +15,16 @@ class KnowledgeBuilder:
             "trigger": ["learn about", "study", "research", "look into"]
         }
 
+    def _summarize(self, prompt: str) -> str:
+        return self.gpt.chat.completions.create(
+            messages=[{"role": "user", "content": prompt}]
+        ).choices[0].message.content.strip()
+
     async def handle(self, user_input: str, context: Any = None) -> str:
-            return "System error: GPT or Memory not initialized in knowledge builder."
+        if not self.memory:
+            return "System error: Memory not initialized in knowledge builder."
+        if not self.gpt:
+            return "[Knowledge Builder] No language model configured."
 
         topic_match = re.search(r"(learn about|study|research|look into) (.+)", user_input.lower())
         if not topic_match:
@@ -26,28 +36,15 @@ class KnowledgeBuilder:
             f"You are LP1, a self-improving modular AI system. Learn about the topic: '{topic}'. "
             f"Summarize it for internal storage only. No conversational formatting, no headers, no user instructions."
         )
-
+        summary = await asyncio.to_thread(self._summarize, prompt)
+        if not summary:
+            return f"Could not learn anything about '{topic}'."
 
         # Check if there's an active goal in memory and tag it
-        goal_id = None
-        for entry in reversed(self.memory.memory):
-            if entry.get("role") == "goal" and entry.get("session_id") == self.memory.session_id:
-                match = re.search(r"\[(goal_[a-z0-9]+)\]", entry.get("content", ""))
-                if match:
-                    goal_id = match.group(1)
-                    break
-
-        embedding = self.memory.embedding_model.encode(summary, convert_to_tensor=True).tolist()
-        entry = {
-            "role": "knowledge",
-            "content": summary,
-            "embedding": embedding,
-            "session_id": self.memory.session_id
-        }
-        if goal_id:
-            entry["goal_id"] = goal_id
+        goal_id = await asyncio.to_thread(self.memory.active_goal_id)
 
-        self.memory.memory.append(entry)
-        self.memory.save()
+        # Goes through MemoryManager.log so repeated topics merge instead of appending.
+        fields = {"goal_id": goal_id} if goal_id else {}
+        await asyncio.to_thread(self.memory.log, "knowledge", summary, **fields)
 
         return "Learned and stored."
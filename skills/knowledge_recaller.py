@@ -1,6 +1,6 @@
 
+import asyncio
 from typing import Any
-from sentence_transformers import util
 
 class KnowledgeRecaller:
     def __init__(self, memory=None):
@@ -17,8 +17,6 @@ class KnowledgeRecaller:
         }
 
     async def handle(self, user_input: str, context: Any = None) -> str:
-        import re
-
         if not self.memory:
             return "System error: memory not initialized in knowledge recall skill."
 
@@ -33,33 +31,22 @@ class KnowledgeRecaller:
         if not topic:
             return "What topic should I recall?"
 
-        query_vec = self.memory.embedding_model.encode(topic, convert_to_tensor=True)
-        matches = []
-
-        active_goal_id = None
-        for entry in reversed(self.memory.memory):
-            if entry.get("role") == "goal" and entry.get("session_id") == self.memory.session_id:
-                match = re.search(r"\[(goal_[a-z0-9]+)\]", entry.get("content", ""))
-                if match:
-                    active_goal_id = match.group(1)
-                    break
+        # Memory may be a remote proxy; keep its blocking calls off the event loop.
+        active_goal_id = await asyncio.to_thread(self.memory.active_goal_id)
 
-        for entry in self.memory.memory:
-            if entry.get("role") != "knowledge":
-                continue
-            if "embedding" not in entry:
-                continue
-            try:
-                score = util.cos_sim(query_vec, entry["embedding"])[0][0].item()
-                # Boost score if entry matches current goal
-                if active_goal_id and entry.get("goal_id") == active_goal_id:
-                    score += 0.2
+        matches = []
+        results = await asyncio.to_thread(self.memory.hybrid_search, topic, limit=5, roles={"knowledge"})
+        for result in results:
+            entry = result["entry"]
+            # Boost score if entry matches current goal
+            boost = 0.2 if active_goal_id and entry.get("goal_id") == active_goal_id else 0.0
+            # Keyword fast-path hits have no cosine score; they count as exact matches.
+            score = (1.0 if result["cosine"] is None else result["cosine"]) + boost
+            if result["fast_path"] or score >= 0.5:
                 matches.append((score, entry))
-            except Exception:
-                continue
 
         matches.sort(reverse=True, key=lambda x: x[0])
-        if not matches or matches[0][0] < 0.5:
+        if not matches:
             return f"No stored knowledge found on '{topic}'."
 
         return matches[0][1]["content"]
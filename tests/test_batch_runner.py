@@ -0,0 +1,65 @@
+import asyncio
+import threading
+import time
+import pytest
+from core.batch_runner import BatchRunner
+
+class FakeSkills:
+    def match(self, user_input):
+        return "echo" if user_input.startswith("echo") else None
+
+    async def execute(self, name, user_input, context=None):
+        if user_input == "echo fail":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.2 if user_input == "echo slow" else 0)
+        return user_input.upper()
+
+class FakeMemory:
+    def __init__(self):
+        self.calls = []
+
+    def recall_many(self, queries, limit=5):
+        self.calls.append(list(queries))
+        return [[{"content": f"about {q}"}] for q in queries]
+
+class FakeRouter:
+    def __init__(self):
+        self.active = {}
+        self.overlap = False
+        self.lock = threading.Lock()
+
+    def choose_model_name(self, user_input):
+        return "code" if "code" in user_input else "chat"
+
+    def run(self, user_input, context):
+        name = self.choose_model_name(user_input)
+        with self.lock:
+            self.overlap |= self.active.get(name, 0) > 0
+            self.active[name] = self.active.get(name, 0) + 1
+        time.sleep(0.05)
+        with self.lock:
+            self.active[name] -= 1
+        return f"{name}: {context.splitlines()[-1]}"
+
+@pytest.mark.asyncio
+async def test_results_stream_in_input_order_and_errors_stay_per_item():
+    memory, router = FakeMemory(), FakeRouter()
+    runner = BatchRunner(FakeSkills(), memory=memory, router=router, concurrency=4)
+    inputs = ["echo slow", "write code", "hello", "echo fail", "more code", "echo hi"]
+
+    results = await runner.run_all(inputs)
+
+    assert [r["index"] for r in results] == list(range(len(inputs)))
+    assert results[0]["response"] == "ECHO SLOW"
+    assert results[1]["response"] == "code: - about write code"
+    assert results[2]["response"] == "chat: - about hello"
+    assert results[3]["error"] == "boom"
+    assert results[5]["response"] == "ECHO HI"
+    # One batched recall for every model-bound input; one call at a time per model.
+    assert memory.calls == [["write code", "more code", "hello"]]
+    assert not router.overlap
+
+@pytest.mark.asyncio
+async def test_without_router_unmatched_inputs_get_the_default_reply():
+    results = await BatchRunner(FakeSkills()).run_all(["hello"])
+    assert results == [{"index": 0, "input": "hello", "response": "[SkillManager] No matching skill found."}]
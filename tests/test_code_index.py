@@ -0,0 +1,27 @@
+import os
+import tempfile
+from core.code_index import CodeIndex, default_cache_path
+
+def test_code_index_reparses_only_changed_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "data"))
+        with open(os.path.join(tmp, "a.py"), "w") as f:
+            f.write('"""Module a."""\nclass A:\n    async def run(self, x):\n        return x\n')
+        with open(os.path.join(tmp, "data", "skip.py"), "w") as f:
+            f.write("def hidden():\n    pass\n")
+
+        cache = os.path.join(tmp, "index.json")
+        index = CodeIndex(tmp, cache_path=cache)
+        assert index.refresh()["parsed"] == 1
+        fn = index.find(os.path.join(tmp, "a.py"), "A.run")
+        assert fn["is_async"] and (fn["lineno"], fn["end_lineno"]) == (3, 4)
+
+        reloaded = CodeIndex(tmp, cache_path=cache)
+        assert reloaded.refresh() == {"files": 1, "parsed": 0, "unchanged": 1, "removed": 0}
+        assert reloaded.entries()[os.path.join(tmp, "a.py")]["module_doc"] == "Module a."
+
+def test_default_cache_is_per_directory():
+    with tempfile.TemporaryDirectory() as tmp:
+        first, second = os.path.join(tmp, "a"), os.path.join(tmp, "b")
+        assert default_cache_path(first) != default_cache_path(second)
+        assert default_cache_path(first) == default_cache_path(first + os.sep)
@@ -0,0 +1,27 @@
+from core.dedup import Deduplicator
+
+def test_exact_and_near_duplicates_merge():
+    dedup = Deduplicator()
+    original = {"id": "k1", "role": "knowledge", "content": "FAISS is a vector index.", "embedding": [1.0, 0.0], "goal_id": "goal_1"}
+    dedup.track(original)
+
+    exact = dedup.find_exact("knowledge", "faiss is a   vector index.")
+    assert exact is original
+    dedup.merge(exact, "faiss is a vector index.", "exact")
+    assert original["hits"] == 2
+
+    assert dedup.find_similar("knowledge", [0.99, 0.05], topic="goal_1") is original
+    assert dedup.find_similar("knowledge", [0.99, 0.05], topic="goal_2") is None
+    assert dedup.find_similar("knowledge", [0.0, 1.0], topic="goal_1") is None
+    assert dedup.find_exact("goal", "anything") is None
+    assert dedup.stats["knowledge"]["exact"] == 1
+
+def test_turns_are_scoped_to_their_session():
+    dedup = Deduplicator({"fallback": {"exact": True, "similarity": None, "window": 0, "same_topic": False, "same_session": True}})
+    old = {"id": "f1", "role": "fallback", "content": "hello -> hi", "session_id": "s1"}
+    dedup.track(old)
+    dedup.track({"id": "u1", "role": "user", "content": "hello", "session_id": "s1"})
+
+    assert dedup.find_exact("fallback", "hello -> hi", session_id="s1") is old
+    assert dedup.find_exact("fallback", "hello -> hi", session_id="s2") is None
+    assert dedup.find_exact("user", "hello", session_id="s1") is None
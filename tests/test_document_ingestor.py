@@ -0,0 +1,57 @@
+import os
+import tempfile
+from core.document_ingestor import DocumentIngestor, chunk_text
+
+def test_chunk_text_overlaps():
+    text = " ".join(str(i) for i in range(10))
+    chunks = chunk_text(text, chunk_size=4, overlap=2)
+    assert chunks[0] == "0 1 2 3"
+    assert chunks[1] == "2 3 4 5"
+    assert chunks[-1].endswith("9")
+    assert chunk_text("") == []
+
+class RecordingSemantic:
+    def __init__(self):
+        self.chunks = []
+
+    def store_many(self, texts, batch_size=256, save=True, sources=None):
+        self.chunks.extend(zip(sources, texts))
+        return len(texts)
+
+    def remove_sources(self, sources, save=True):
+        before = len(self.chunks)
+        self.chunks = [c for c in self.chunks if c[0] not in sources]
+        return before - len(self.chunks)
+
+    def save(self):
+        pass
+
+def write_sheet(path, *rows):
+    from openpyxl import Workbook
+    wb = Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.save(path)
+
+def test_ingest_skips_unchanged_resumes_and_replaces_changed_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        docs = os.path.join(tmp, "docs")
+        os.makedirs(docs)
+        first, second = os.path.join(docs, "a.xlsx"), os.path.join(docs, "REPORT.XLSX")
+        write_sheet(first, ["alpha", "beta"])
+        write_sheet(second, ["gamma"])
+        config = {"data_path": tmp}
+        semantic = RecordingSemantic()
+
+        stats = DocumentIngestor(config, semantic, workers=2).ingest(docs)
+        assert (stats["ingested"], stats["failed"]) == (2, 0)
+
+        # A fresh ingestor resumes from the manifest and skips unchanged files.
+        stats = DocumentIngestor(config, semantic, workers=2).ingest(docs)
+        assert (stats["ingested"], stats["skipped"]) == (0, 2)
+
+        write_sheet(first, ["delta"])
+        stats = DocumentIngestor(config, semantic, workers=2).ingest(docs)
+        assert (stats["ingested"], stats["skipped"]) == (1, 1)
+        assert sorted(text for source, text in semantic.chunks if source == first) == ["delta"]
+        assert [text for source, text in semantic.chunks if source == second] == ["gamma"]
@@ -0,0 +1,48 @@
+import json
+import os
+import tempfile
+from core.feedback_engine import FeedbackEngine
+
+def test_feedback_record_and_stats():
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"log_feedback": os.path.join(tmp, "feedback.jsonl")}
+        engine = FeedbackEngine(config)
+
+        first = engine.register("system status", "ok", skill="diagnostics")
+        second = engine.register("hello", "hi", skill="fallback")
+        assert engine.record(first, "yes")["skill"] == "diagnostics"
+        assert engine.record(second, "no")["feedback"] == "no"
+        assert engine.record(second, "maybe") is None
+
+        with open(config["log_feedback"]) as f:
+            assert len([json.loads(line) for line in f]) == 2
+
+        reloaded = FeedbackEngine(config)
+        assert reloaded.summary()["all"]["helpful_rate"] == 0.5
+        assert reloaded.summary("skill")["diagnostics"]["helpful"] == 1
+
+def test_unknown_and_consumed_ids_are_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = FeedbackEngine({"log_feedback": os.path.join(tmp, "feedback.jsonl")})
+        response_id = engine.register("hello", "hi", skill="fallback", model="tiny")
+
+        assert engine.record("made-up", "yes") is None
+        assert engine.record(response_id, "yes")["model"] == "tiny"
+        assert engine.record(response_id, "yes") is None
+        assert engine.summary()["all"]["total"] == 1
+        assert engine.summary("model") == {"tiny": {"helpful": 1, "total": 1, "helpful_rate": 1.0}}
+
+def test_feedback_handler_rates_the_last_response_once():
+    import asyncio
+    from skills.feedback_handler import FeedbackHandler
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = FeedbackEngine({"log_feedback": os.path.join(tmp, "feedback.jsonl")})
+        handler = FeedbackHandler(feedback=engine)
+        assert asyncio.run(handler.handle("yes")) == "No response to provide feedback on."
+
+        response_id = engine.register("system status", "ok", skill="diagnostics")
+        handler.set_context("system status", "ok", response_id=response_id)
+        assert asyncio.run(handler.handle("Yes")) == "Feedback saved."
+        assert asyncio.run(handler.handle("no")) == "No response to provide feedback on."
+        assert engine.summary("skill")["diagnostics"]["helpful"] == 1
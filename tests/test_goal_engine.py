@@ -0,0 +1,46 @@
+import asyncio
+import os
+import tempfile
+from types import SimpleNamespace
+from core.goal_engine import GoalEngine
+
+class DummyMemory:
+    def __init__(self):
+        self.entries = []
+        self.flushed = False
+
+    def log(self, role, content, persist=True):
+        self.entries.append((role, content))
+
+    def flush(self):
+        self.flushed = True
+
+class SlowGPT:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, messages):
+        if "hang" in messages[1]["content"]:
+            import time
+            time.sleep(0.5)
+        return SimpleNamespace(choices=[SimpleNamespace(message="step 1")])
+
+def test_goal_index_and_concurrent_evaluate():
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"data_path": tmp, "goal_concurrency": 8, "goal_timeout": 0.2}
+        memory = DummyMemory()
+        engine = GoalEngine(config, memory=memory, gpt=SlowGPT())
+        active = engine.add_goal("stay active")
+        pending = [engine.add_goal(f"goal {i}", status="pending") for i in range(5)]
+        stuck = engine.add_goal("hang forever", status="pending")
+
+        assert [g["goal_id"] for g in engine.get_active_goals()] == [active]
+        assert os.path.exists(engine.journal_path)
+
+        assert asyncio.run(engine.evaluate()) == {"processed": 5, "failed": 1}
+        assert memory.flushed and not os.path.exists(engine.journal_path)
+
+        reloaded = GoalEngine(config, memory=memory, gpt=None)
+        assert all(reloaded.get_goal_by_id(g)["status"] == "processed" for g in pending)
+        assert reloaded.get_goal_by_id(stuck)["status"] == "pending"
+        assert reloaded.get_goal_by_id(stuck)["attempts"] == 1
@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+from core.code_index import CodeIndex
+from core.hot_reloader import HotReloader, same_interface
+from core.live_swapper import LiveSwapper
+
+V1 = "class Counter:\n    def __init__(self):\n        self.count = 0\n    def bump(self):\n        self.count += 1\n        return self.count\n"
+V2 = V1.replace("self.count += 1", "self.count += 10")
+BROKEN = V2 + "raise RuntimeError('boom')\n"
+RENAMED = V2.replace("def bump", "def increment")
+
+def test_live_swap_hot_reloads_and_rolls_back():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lp1_hot_counter.py")
+        with open(path, "w") as f:
+            f.write(V1)
+        sys.path.insert(0, tmp)
+        try:
+            import lp1_hot_counter
+            counter = lp1_hot_counter.Counter()
+            counter.bump()
+
+            reloader = HotReloader(base_dir=tmp)
+            reloader.register(counter, smoke=same_interface(counter))
+            swapper = LiveSwapper(log_dir=os.path.join(tmp, "rewrites"), reloader=reloader)
+
+            assert "hot-reloaded" in swapper.apply(path, V2)
+            assert counter.bump() == 11
+
+            assert "restored" in swapper.apply(path, BROKEN)
+            with open(path) as f:
+                assert f.read() == V2
+            assert counter.bump() == 21
+
+            # The smoke check rejects a reload that drops a method callers rely on.
+            assert "restored" in swapper.apply(path, RENAMED)
+            assert counter.bump() == 31
+            assert "Hot-reloaded" in swapper.reload(path)
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop("lp1_hot_counter", None)
+
+SLOW = (
+    "def helper():\n    return 'kept'\n\n"
+    "def total(n):\n    result = 0\n    for i in range(n):\n        result += i\n    return result\n\n"
+    "class Box:\n    def size(self):\n        return 1\n"
+)
+FAST_TOTAL = "def total(n):\n    return n * (n - 1) // 2\n"
+
+def test_apply_if_faster_splices_a_function_only_rewrite():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "lp1_slow_math.py")
+        with open(path, "w") as f:
+            f.write(SLOW)
+        sys.path.insert(0, tmp)
+        try:
+            import lp1_slow_math
+            swapper = LiveSwapper(log_dir=os.path.join(tmp, "rewrites"),
+                                  index=CodeIndex(tmp, cache_path=None), reloader=HotReloader(base_dir=tmp))
+
+            # Methods keep their indentation when the rewrite comes back dedented.
+            spliced = swapper.splice(path, "Box.size", "def size(self):\n    return 2\n")
+            assert "class Box:\n    def size(self):\n        return 2\n" in spliced
+
+            outcome = swapper.apply_if_faster(path, FAST_TOTAL, "total", args=(20000,), min_speedup=1.5)
+            assert "faster" in outcome
+            with open(path) as f:
+                source = f.read()
+            assert "return n * (n - 1) // 2" in source and "def helper" in source and "class Box" in source
+            assert lp1_slow_math.total(10) == 45 and lp1_slow_math.helper() == "kept"
+            assert "not found" in swapper.apply_if_faster(path, FAST_TOTAL, "missing")
+        finally:
+            sys.path.remove(tmp)
+            sys.modules.pop("lp1_slow_math", None)
@@ -0,0 +1,23 @@
+import time
+import pytest
+from core.lifecycle import ComponentRegistry
+
+@pytest.mark.asyncio
+async def test_registry_builds_concurrently_with_dependencies():
+    registry = ComponentRegistry(warmup=True)
+    warmed = []
+    registry.register("a", lambda: time.sleep(0.2) or "A", warmup=warmed.append)
+    registry.register("b", lambda: time.sleep(0.2) or "B")
+    registry.register("c", lambda a, b: a + b, deps=("a", "b"))
+    registry.register("broken", lambda: 1 / 0)
+
+    assert not registry.ready
+    start = time.perf_counter()
+    errors = await registry.start_all()
+    assert time.perf_counter() - start < 0.35
+
+    assert await registry.get("c") == "AB"
+    assert warmed == ["A"]
+    assert len(errors) == 1 and not registry.ready
+    assert registry.report["broken"]["status"] == "failed"
+    assert "warmup_ms" in registry.report["a"]
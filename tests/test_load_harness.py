@@ -0,0 +1,58 @@
+import asyncio
+import time
+import numpy as np
+import pytest
+from core.load_harness import (FakeLlama, FakeSentenceTransformer, LoopLagMonitor, misrouted, parse_mix,
+                               percentile, summarize)
+
+def test_percentile_and_summary():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([], 95) == 0.0
+
+    samples = [("skill", 0.01, True), ("skill", 0.03, False), ("light", 0.02, True), ("light", 0.02, True)]
+    report = summarize(samples, duration=2.0)
+    assert report["all"]["requests"] == 4
+    assert report["all"]["throughput_rps"] == 2.0
+    assert report["all"]["error_rate"] == 0.25
+    assert report["skill"]["p99_ms"] == 30.0
+
+def test_parse_mix():
+    mix = parse_mix("skill=1, llm=2")
+    assert mix["skill"] == 1 and mix["llm"] == 2 and mix["light"] > 0
+    with pytest.raises(ValueError):
+        parse_mix("bogus=1")
+
+def test_stand_in_models():
+    model = FakeSentenceTransformer()
+    model.latency = model.per_item = 0
+    batch = model.encode(["a", "b"])
+    assert batch.shape == (2, 384)
+    assert np.allclose(model.encode("a"), batch[0])
+
+    llm = FakeLlama()
+    llm.prompt_latency, llm.token_latency, llm.tokens = 0, 0, 3
+    chunks = list(llm("prompt", stream=True))
+    assert [c["choices"][0]["text"] for c in chunks] == [" tok0", " tok1", " tok2"]
+
+def test_loop_lag_monitor_sees_blocking_calls():
+    async def scenario():
+        monitor = LoopLagMonitor(interval=0.005)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)  # stalls the loop the way a blocking skill would
+        await asyncio.sleep(0.02)
+        return await monitor.stop()
+
+    assert asyncio.run(scenario())["max_ms"] >= 80
+
+def test_misrouted_flags_prompts_that_miss_their_code_path():
+    class Skills:
+        def match(self, prompt):
+            return "feedback_handler" if "no" in prompt else None
+
+    mix = parse_mix("skill=0,light=0,llm=1")
+    assert misrouted(Skills(), mix) == []
+    flagged = misrouted(Skills(), parse_mix("skill=0,llm=0"))
+    assert all(kind == "light" for kind, _, _ in flagged) and len(flagged) == 3
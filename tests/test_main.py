@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+import main
+
+class FakeMemory:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.session_id = "s1"
+        self.memory = []
+        self.flushed = []
+
+    def log(self, role, content, persist=True):
+        time.sleep(0.02)  # writes finish after the next prompt is already shown
+        self.memory.append({"role": role, "content": content, "session_id": self.session_id, "persist": persist})
+
+    def flush(self):
+        self.flushed.append(len(self.memory))
+
+class FakeSkills:
+    skills = {"echo": None}
+
+    def match(self, user_input):
+        return "echo" if user_input.startswith("echo") else None
+
+    async def route(self, user_input):
+        return user_input.upper()
+
+class FakeModel:
+    def __init__(self):
+        self.contexts = []
+
+    def run_inference(self, user_input, context=""):
+        self.contexts.append(context)
+        return f"re: {user_input}"
+
+def test_turns_are_logged_in_order_and_flushed_each_turn():
+    memory, model, output = FakeMemory(), FakeModel(), []
+    inputs = iter(["hello", "echo hi", "bye", "exit"])
+
+    async def read():
+        return next(inputs)
+
+    asyncio.run(main.run(model, memory, None, FakeSkills(), read=read, write=output.append))
+
+    assert [(e["role"], e["content"]) for e in memory.memory] == [
+        ("user", "hello"), ("assistant", "re: hello"),
+        ("user", "echo hi"), ("assistant", "re: echo hi"),
+        ("user", "bye"), ("assistant", "re: bye"),
+    ]
+    assert not any(e["persist"] for e in memory.memory)
+    assert memory.flushed == [2, 4, 6, 6]
+    # Each turn's context is built after the previous turn's writes landed.
+    assert "user: hello" in model.contexts[1] and "assistant: re: echo hi" in model.contexts[2]
+    assert "LP1 [skill]: ECHO HI" in output
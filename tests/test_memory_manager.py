@@ -14,3 +14,32 @@ def test_memory_log_and_recall():
         history = mem.recall(limit=2)
         assert len(history) == 2
         assert history[0]["content"] == "something happened"
+
+def test_repeated_turn_in_new_session_is_recalled():
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"memory_file": os.path.join(tmp, "test_memory.json")}
+        first = MemoryManager(config)
+        first_id = first.log("user", "hello")
+
+        second = MemoryManager(config)
+        second_id = second.log("user", "hello")
+
+        assert second_id != first_id
+        assert [e["id"] for e in second.recall("hello")] == [second_id]
+
+def test_knowledge_builder_merges_repeated_topics():
+    import asyncio
+    from types import SimpleNamespace
+    from core.skill_manager import SkillManager
+
+    summary = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="FAISS is a vector index."))])
+    gpt = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=lambda **kwargs: summary)))
+    with tempfile.TemporaryDirectory() as tmp:
+        mem = MemoryManager({"memory_file": os.path.join(tmp, "test_memory.json")})
+        skills = SkillManager({}, gpt=gpt, memory=mem, semantic=None)
+        assert "knowledge_builder" in skills.skills
+
+        for _ in range(2):
+            assert asyncio.run(skills.route("learn about faiss")) == "Learned and stored."
+        knowledge = [e for e in mem.memory if e["role"] == "knowledge"]
+        assert len(knowledge) == 1 and knowledge[0]["hits"] == 2
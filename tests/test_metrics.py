@@ -0,0 +1,31 @@
+from core.metrics import MetricsAggregator, MetricsRegistry, request_timings
+
+def test_metrics_render_and_request_timings():
+    registry = MetricsRegistry()
+    with request_timings() as timings:
+        with registry.timer("encode", component="memory"):
+            pass
+        registry.observe("llm_generation", 0.2, model="tiny")
+    registry.inc("lp1_llm_tokens_total", 5, model="tiny")
+
+    assert [t["stage"] for t in timings] == ["encode", "llm_generation"]
+    output = registry.render()
+    assert 'lp1_stage_duration_seconds_count{component="memory",stage="encode"} 1' in output
+    assert 'lp1_stage_duration_seconds_bucket{model="tiny",stage="llm_generation",le="0.25"} 1' in output
+    assert 'lp1_llm_tokens_total{model="tiny"} 5' in output
+
+def test_snapshots_from_other_processes_merge_additively():
+    state, worker = MetricsRegistry(), MetricsRegistry()
+    state.observe("encode", 0.02, component="memory")
+    worker.observe("encode", 0.02, component="memory")
+    worker.observe("skill_execution", 0.3, skill="diagnostics")
+    worker.inc("lp1_skill_calls_total", 2, skill="diagnostics")
+
+    hub = MetricsAggregator(state)
+    hub.push("worker-1", worker.snapshot())
+    hub.push("worker-1", worker.snapshot())  # re-push replaces, never double counts
+    output = hub.render()
+    assert 'lp1_stage_duration_seconds_count{component="memory",stage="encode"} 2' in output
+    assert 'lp1_stage_duration_seconds_count{skill="diagnostics",stage="skill_execution"} 1' in output
+    assert 'lp1_skill_calls_total{skill="diagnostics"} 2' in output
+    assert output.count("# TYPE lp1_stage_duration_seconds histogram") == 1
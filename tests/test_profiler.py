@@ -0,0 +1,35 @@
+import os
+import tempfile
+import time
+import pytest
+from core.profiler import SamplingProfiler, ab_compare
+
+def busy_loop(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+def test_sampling_profiler_ranks_hot_function():
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = SamplingProfiler(interval=0.001, report_path=os.path.join(tmp, "hot.json"),
+                                    base_dir=os.path.dirname(__file__))
+        profiler.start()
+        busy_loop(0.3)
+        profiler.stop()
+
+        report = profiler.save_report()
+        assert os.path.exists(profiler.report_path)
+        assert "busy_loop" in [f["function"] for f in report["functions"]]
+
+def test_non_positive_intervals_are_rejected_and_tiny_ones_clamped():
+    profiler = SamplingProfiler(report_path=None)
+    for interval in (0, -1):
+        with pytest.raises(ValueError):
+            profiler.start(interval)
+    assert not profiler.running
+    assert SamplingProfiler(interval=1e-9, report_path=None).interval == 0.001
+
+def test_ab_compare_detects_faster_candidate():
+    result = ab_compare(lambda n: sum([i for i in range(n)]), lambda n: n * (n - 1) // 2, args=(2000,), repeat=3)
+    assert result["same_result"]
+    assert result["speedup"] > 1
@@ -0,0 +1,45 @@
+import asyncio
+from datetime import datetime
+import pytest
+from core.scheduler import CronSchedule, Scheduler
+
+def test_cron_next_after():
+    cron = CronSchedule("*/15 2 * * *")
+    assert cron.next_after(datetime(2024, 1, 1, 1, 50)) == datetime(2024, 1, 1, 2, 0)
+    assert cron.next_after(datetime(2024, 1, 1, 2, 45)) == datetime(2024, 1, 2, 2, 0)
+    assert CronSchedule("0 0 1 3 *").next_after(datetime(2024, 3, 5)) == datetime(2025, 3, 1)
+
+def test_cron_weekdays_follow_standard_semantics():
+    # 2024-01-01 is a Monday; 0 and 7 both mean Sunday.
+    assert CronSchedule("0 3 * * 0").next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 7, 3, 0)
+    assert CronSchedule("0 3 * * 7").next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 7, 3, 0)
+    assert CronSchedule("0 3 * * 1-5").next_after(datetime(2024, 1, 5, 4)) == datetime(2024, 1, 8, 3, 0)
+    # Both day fields restricted: the 15th OR any Friday.
+    both = CronSchedule("0 0 15 * 5")
+    assert both.next_after(datetime(2024, 1, 1)) == datetime(2024, 1, 5)
+    assert both.next_after(datetime(2024, 1, 13)) == datetime(2024, 1, 15)
+
+@pytest.mark.asyncio
+async def test_scheduler_runs_tasks_concurrently_and_shuts_down():
+    scheduler = Scheduler({}, skills=None, startup_delay=0)
+    scheduler.remove_task("self_check")
+    calls = []
+
+    async def slow():
+        calls.append("slow")
+        await asyncio.sleep(10)
+
+    async def fast():
+        calls.append("fast")
+
+    scheduler.add_task("slow", slow, interval=60)
+    scheduler.add_task("fast", fast, interval=0.05, timeout=1)
+    stop = asyncio.Event()
+    runner = asyncio.create_task(scheduler.run_background_tasks(stop))
+    await asyncio.sleep(0.3)
+    stop.set()
+    await asyncio.wait_for(runner, timeout=1)
+
+    assert calls.count("slow") == 1
+    assert calls.count("fast") >= 3
+    assert not scheduler._running
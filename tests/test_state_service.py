@@ -0,0 +1,70 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.state_service import StateClient, StateServer
+
+class DummyMemory:
+    def __init__(self):
+        self.entries = {}
+
+    def log(self, role, content):
+        self.entries[content] = {"role": role, "content": content}
+        return content
+
+    def flush(self):
+        self.flushed = True
+
+    def get(self, entry_id):
+        return self.entries.get(entry_id)
+
+    def hybrid_search(self, query, limit=5, roles=None):
+        time.sleep(0.2)
+        return [e for e in self.entries.values() if roles is None or e["role"] in roles]
+
+def start_server(tmp, memory):
+    path = os.path.join(tmp, "state.sock")
+    server = StateServer({}, socket_path=path, targets={"memory": memory})
+    threading.Thread(target=asyncio.run, args=(server.serve(),), daemon=True).start()
+    while not os.path.exists(path):
+        time.sleep(0.01)
+    return path
+
+def test_state_client_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        dummy = DummyMemory()
+        memory = StateClient(start_server(tmp, dummy)).proxy("memory")
+        assert memory.log("user", "hello") == "hello"
+        assert memory.get("hello")["role"] == "user"
+        assert memory.get("missing") is None
+
+def test_sets_serialize_and_calls_from_workers_overlap():
+    with tempfile.TemporaryDirectory() as tmp:
+        dummy = DummyMemory()
+        dummy.log("knowledge", "faiss")
+        dummy.log("user", "hi")
+        memory = StateClient(start_server(tmp, dummy)).proxy("memory")
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda _: memory.hybrid_search("faiss", roles={"knowledge"}), range(4)))
+        assert time.perf_counter() - start < 0.6
+        assert all([r["content"] for r in result] == ["faiss"] for result in results)
+
+def test_shutdown_flushes_targets_and_removes_socket():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "state.sock")
+        dummy = DummyMemory()
+        server = StateServer({}, socket_path=path, targets={"memory": dummy})
+
+        async def run_briefly():
+            try:
+                await asyncio.wait_for(server.serve(), timeout=0.2)
+            except asyncio.TimeoutError:
+                pass
+
+        asyncio.run(run_briefly())
+        assert dummy.flushed
+        assert not os.path.exists(path)
@@ -0,0 +1,35 @@
+import os
+import tempfile
+from core.syntax_validator import affected_tests, check_source, files_touched_by_patch, validate_workspace
+
+PATCH = """--- a/core/foo.py
++++ b/core/foo.py
+@@ -1 +1 @@
+-x = 1
++x = (
+--- a/README.md
++++ b/README.md
+@@ -1 +1 @@
+-old
++new
+"""
+
+def test_validate_workspace_reports_touched_files_only():
+    with tempfile.TemporaryDirectory() as root:
+        for rel, body in [("core/foo.py", "x = (\n"), ("core/bar.py", "def broken(:\n"),
+                          ("tests/test_foo.py", "from core.foo import x\n"), ("README.md", "new\n")]:
+            os.makedirs(os.path.join(root, os.path.dirname(rel)), exist_ok=True)
+            with open(os.path.join(root, rel), "w") as f:
+                f.write(body)
+
+        assert files_touched_by_patch(PATCH) == ["core/foo.py", "README.md"]
+        assert affected_tests(["core/foo.py"], root) == ["tests/test_foo.py"]
+
+        report = validate_workspace(root, PATCH)
+        assert not report["ok"]
+        assert [r["file"] for r in report["files"]] == [os.path.join("core", "foo.py")]
+        assert report["files"][0]["line"] == 1
+
+def test_check_source():
+    assert check_source("def ok():\n    return 1\n")["ok"]
+    assert not check_source("def bad(:\n")["ok"]
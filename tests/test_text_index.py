@@ -0,0 +1,20 @@
+from core.text_index import BM25Index, keyword_confident, reciprocal_rank_fusion, tokenize
+
+def test_bm25_finds_exact_identifiers():
+    index = BM25Index()
+    index.add("a", "Traceback: KeyError in core/memory_manager.py line 42")
+    index.add("b", "The weather is nice and the memory of summer lingers")
+    index.add("c", "Notes about faiss vector search")
+
+    assert "memory_manager" in tokenize("core/memory_manager.py")
+    results = index.search("memory_manager.py KeyError")
+    assert results[0][0] == "a"
+    assert keyword_confident(results)
+
+    index.remove("a")
+    assert all(doc_id != "a" for doc_id, _ in index.search("KeyError"))
+
+def test_reciprocal_rank_fusion_prefers_consensus():
+    fused = reciprocal_rank_fusion([["x", "y", "z"], ["y", "x", "w"]])
+    assert {fused[0][0], fused[1][0]} == {"x", "y"}
+    assert fused[-1][0] in {"z", "w"}
@@ -0,0 +1,22 @@
+import os
+import subprocess
+import tempfile
+from core.workspace import check_patch, isolated_workspace, source_files
+
+def test_workspace_skips_data_and_models():
+    with tempfile.TemporaryDirectory() as repo:
+        for rel in ["core/a.py", "data/memory.json", "models/big.gguf", "py311/pyvenv.cfg", "py311/lib/site.py"]:
+            os.makedirs(os.path.join(repo, os.path.dirname(rel)), exist_ok=True)
+            with open(os.path.join(repo, rel), "w") as f:
+                f.write("x = 1\n")
+        subprocess.run(["git", "init", "-q", repo], check=True)
+
+        assert source_files(repo) == ["core/a.py"]
+        with isolated_workspace(repo) as ws:
+            assert os.path.exists(os.path.join(ws, "core", "a.py"))
+            assert not os.path.exists(os.path.join(ws, "models"))
+
+        patch = os.path.join(repo, "fix.diff")
+        with open(patch, "w") as f:
+            f.write("--- a/core/a.py\n+++ b/core/a.py\n@@ -1 +1 @@\n-x = 1\n+x = 2\n")
+        assert check_patch(repo, patch)[0]
@@ -1,37 +1,225 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 import asyncio
+import json
+import os
 from core.config import load_config
-from core.skill_manager import SkillManager
-from core.patch_engine import PatchEngine
-from core.memory_manager import MemoryManager
-from core.scheduler import Scheduler
-from core.feedback_engine import FeedbackEngine
-from core.goal_engine import GoalEngine
-from core.semantic_memory import SemanticMemory
+from core.feedback_engine import FEEDBACK_VALUES
+from core.batch_runner import BatchRunner
+from core.lifecycle import ComponentRegistry
+from core.metrics import metrics, request_timings
+from core.profiler import SamplingProfiler
 
-app = FastAPI()
+# Heavy modules (sentence-transformers, faiss, skills) are imported inside the
+# component factories so the process can answer /healthz while they load.
 
 class Query(BaseModel):
     input: str
+    debug: bool = False
+
+class BatchQuery(BaseModel):
+    inputs: list[str]
+    concurrency: int = 4
+
+class Feedback(BaseModel):
+    response_id: str
+    feedback: str
+
+class Reload(BaseModel):
+    path: str
 
 config = load_config()
-memory = MemoryManager(config)
-semantic = SemanticMemory(config)
-skills = SkillManager(config, gpt=gpt, memory=memory, semantic=semantic)
-feedback = FeedbackEngine(config)
-goals = GoalEngine(config, memory=memory, gpt=gpt)
+gpt = None  # No hosted GPT client is configured for the web server.
+registry = ComponentRegistry(warmup=config["warmup"])
+profiler = SamplingProfiler(report_path=config["profile_report"])
+
+if config["state_socket"]:
+    # Multi-worker mode: shared state lives in `python -m core.state_service`.
+    from core.state_service import StateClient
+
+    state = StateClient(config["state_socket"])
+    for name in ("memory", "semantic", "goals", "feedback"):
+        registry.register(name, lambda name=name: state.proxy(name))
+else:
+    def build_memory():
+        from core.memory_manager import MemoryManager
+        return MemoryManager(config)
+
+    def build_semantic():
+        from core.semantic_memory import SemanticMemory
+        return SemanticMemory(config)
+
+    def build_goals(memory):
+        from core.goal_engine import GoalEngine
+        return GoalEngine(config, memory=memory, gpt=gpt)
+
+    def build_feedback():
+        from core.feedback_engine import FeedbackEngine
+        return FeedbackEngine(config)
+
+    registry.register("memory", build_memory, warmup=lambda m: m.embedding_model.encode("warm-up"), close=lambda m: m.flush())
+    registry.register("semantic", build_semantic, warmup=lambda s: s.model.encode(["warm-up"]))
+    registry.register("goals", build_goals, deps=("memory",))
+    registry.register("feedback", build_feedback)
+
+def build_skills(memory, semantic, goals, feedback):
+    from core.skill_manager import SkillManager
+    return SkillManager(config, gpt=gpt, memory=memory, semantic=semantic, goal_engine=goals, feedback=feedback)
+
+registry.register("skills", build_skills, deps=("memory", "semantic", "goals", "feedback"))
+
+if config["local_models"]:
+    def build_router():
+        from core.llm_router import LP1Router
+        return LP1Router()
+
+    registry.register("router", build_router, warmup=lambda r: r.warmup())
+
+def build_swapper(skills, *objects):
+    from core.hot_reloader import HotReloader, same_interface
+    from core.live_swapper import LiveSwapper
+
+    # One reloader per process: a swapped module rebinds the live skills and core
+    # objects in place, so loaded models and indexes survive the reload.
+    reloader = HotReloader(skills=skills)
+    for obj in (skills, *objects):
+        reloader.register(obj, smoke=same_interface(obj))
+    return LiveSwapper(log_dir=os.path.join(config["data_path"], "rewrites"), reloader=reloader)
+
+# State-service proxies are not reloadable here; that process owns the real objects.
+live_objects = () if config["state_socket"] else ("memory", "semantic", "goals", "feedback")
+registry.register("swapper", build_swapper, deps=("skills", *live_objects) + (("router",) if config["local_models"] else ()))
+
+async def push_metrics():
+    # Multi-worker mode: the state service merges every worker's metrics with its own
+    # (encode/recall/persist run there), so any worker can serve the fleet-wide view.
+    await asyncio.to_thread(state.call, "metrics", "push", f"worker-{os.getpid()}", metrics.snapshot())
+
+async def push_metrics_loop(interval: float = 10.0):
+    while True:
+        try:
+            await push_metrics()
+        except Exception as e:
+            print(f"[Metrics] Push to state service failed: {e}")
+        await asyncio.sleep(interval)
+
+@asynccontextmanager
+async def lifespan(app):
+    # Start loading in the background; handlers await whatever they need.
+    background = [asyncio.create_task(registry.start_all())]
+    if config["state_socket"]:
+        background.append(asyncio.create_task(push_metrics_loop()))
+    yield
+    for task in background:
+        task.cancel()
+    await registry.shutdown()
+
+app = FastAPI(lifespan=lifespan)
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    body = {"ready": registry.ready, "components": registry.report}
+    return JSONResponse(body, status_code=200 if registry.ready else 503)
 
 @app.post("/ask")
 async def ask(query: Query):
     try:
+        skills = await registry.get("skills")
+        memory = await registry.get("memory")
+        feedback = await registry.get("feedback")
+        router = await registry.get("router") if config["local_models"] else None
         user_input = query.input.strip()
-        response = await skills.route(user_input)
-        await feedback.capture(user_input, response)
-        return {"response": response}
+        with request_timings() as timings:
+            with metrics.timer("request", endpoint="ask"):
+                # Same routing as /ask/batch, so unmatched prompts reach the local models when enabled.
+                answer = (await BatchRunner(skills, memory=memory, router=router).run_all([user_input]))[0]
+                if "error" in answer:
+                    raise RuntimeError(answer["error"])
+                response, skill = answer["response"], answer.get("skill")
+                # Feedback may be a state-service proxy; its socket I/O must not block the loop.
+                response_id = await asyncio.to_thread(
+                    feedback.register, user_input, response, skill=skill, model=answer.get("model")
+                )
+                if skill != "feedback_handler":
+                    skills.set_last_response(user_input, response, response_id)
+        result = {"response": response, "response_id": response_id}
+        if query.debug:
+            result["timings"] = timings
+        return result
     except Exception as e:
+        metrics.inc("lp1_request_errors_total", help_text="Failed requests.", endpoint="ask")
         return {"error": str(e)}
 
+@app.post("/ask/batch")
+async def ask_batch(query: BatchQuery):
+    skills = await registry.get("skills")
+    memory = await registry.get("memory")
+    router = await registry.get("router") if config["local_models"] else None
+    runner = BatchRunner(skills, memory=memory, router=router, concurrency=min(max(1, query.concurrency), config["batch_max_concurrency"]))
+
+    async def stream():
+        with metrics.timer("request", endpoint="ask_batch"):
+            async for result in runner.run(query.inputs):
+                if "error" in result:
+                    metrics.inc("lp1_request_errors_total", help_text="Failed requests.", endpoint="ask_batch")
+                yield json.dumps(result) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+@app.post("/feedback")
+async def submit_feedback(entry: Feedback):
+    if entry.feedback.strip().lower() not in FEEDBACK_VALUES:
+        return {"error": "Feedback not recognized. Use 'yes' or 'no'."}
+    feedback = await registry.get("feedback")
+    logged = await asyncio.to_thread(feedback.record, entry.response_id, entry.feedback)
+    if logged is None:
+        return JSONResponse({"error": "Unknown or already-rated response_id."}, status_code=404)
+    return {"status": "recorded"}
+
+@app.get("/feedback/stats")
+async def feedback_stats(dimension: str = "all", day: str = None):
+    feedback = await registry.get("feedback")
+    return await asyncio.to_thread(feedback.summary, dimension, day)
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    if config["state_socket"]:
+        await push_metrics()
+        body = await asyncio.to_thread(state.call, "metrics", "render")
+    else:
+        body = metrics.render()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+@app.post("/reload")
+async def reload_module(body: Reload):
+    swapper = await registry.get("swapper")
+    # Runs on the event loop so no request sees a half-rebound object.
+    return {"result": swapper.reload(body.path)}
+
+@app.post("/profiler/start")
+async def profiler_start(interval: float = None):
+    try:
+        started = profiler.start(interval)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return {"running": profiler.running, "started": started}
+
+@app.post("/profiler/stop")
+async def profiler_stop():
+    stopped = profiler.stop()
+    report = profiler.save_report()
+    return {"running": profiler.running, "stopped": stopped, "report": report["functions"][:20]}
+
+@app.get("/profiler/report")
+async def profiler_report(limit: int = 20, window: int = None):
+    return {"running": profiler.running, "functions": profiler.report(limit=limit, window=window)}
+
 if __name__ == "__main__":
     uvicorn.run("web_server:app", host="0.0.0.0", port=8000, reload=True)